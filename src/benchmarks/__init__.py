@@ -0,0 +1,5 @@
+"""
+DraXon FORGE Benchmarks
+Standalone scripts for measuring database and cache performance.
+Run from the src directory, e.g. `python -m benchmarks.ingest`.
+"""
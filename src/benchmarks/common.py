@@ -0,0 +1,33 @@
+import asyncpg
+import os
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+# User ID reserved for benchmark rows; never a real Discord snowflake
+BENCH_USER_ID = 0
+
+def load_env():
+    """Load environment variables from the env directory"""
+    env_path = Path(__file__).parent.parent.parent / 'env' / '.env'
+    load_dotenv(env_path)
+
+async def connect() -> asyncpg.Connection:
+    """Open a connection to the configured PostgreSQL database"""
+    load_env()
+    return await asyncpg.connect(
+        user=os.getenv('DB_USER'),
+        password=os.getenv('DB_PASSWORD'),
+        database=os.getenv('DB_NAME'),
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=os.getenv('DB_PORT', '5432')
+    )
+
+class Timer:
+    """Context manager measuring elapsed wall time in milliseconds"""
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed_ms = (time.perf_counter() - self.start) * 1000
@@ -0,0 +1,273 @@
+"""
+Generate synthetic XPLOR shiplist.json data and seed it for scale tests.
+
+Hangars are deterministic for a given seed and user, and follow rough
+real-world shapes: most members have a handful of pledges and a few have
+hundreds, popular ships dominate, older pledges mostly carry LTI, and
+some ships have custom names. Orgs are generated one member at a time,
+so 10k members x 200 pledges never has to fit in memory.
+
+    python -m benchmarks.dataset write --users 50 --out fixtures/
+    python -m benchmarks.dataset seed --users 10000 --max-pledges 200 --guild
+    python -m benchmarks.dataset clear --users 10000
+
+Seeding COPYs rows straight into hangar_ships for reserved user IDs
+starting at 1, and with --guild also builds fleet aggregates for the
+reserved guild 0. Summaries are rebuilt on first read.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+from benchmarks.common import connect
+from db.database import ship_record
+from db.statements import HANGAR_COLUMNS, STATEMENTS
+
+# Guild and first user ID reserved for seeded rows
+BENCH_GUILD_ID = 0
+FIRST_USER_ID = 1
+
+# (code, manufacturer, [(model, popularity, price in USD)])
+CATALOG = [
+    ('AEGS', 'Aegis Dynamics', [
+        ('Avenger Titan', 30, 55), ('Gladius', 22, 90), ('Sabre', 14, 170),
+        ('Vanguard Warden', 8, 260), ('Hammerhead', 5, 725), ('Reclaimer', 6, 400),
+        ('Eclipse', 5, 300), ('Idris-P', 2, 1500), ('Javelin', 1, 3000)
+    ]),
+    ('ANVL', 'Anvil Aerospace', [
+        ('Arrow', 14, 75), ('Hornet F7C Mk II', 16, 175), ('Valkyrie', 10, 375),
+        ('Carrack', 12, 600), ('Terrapin', 6, 220), ('Pisces C8X', 12, 45),
+        ('Hurricane', 6, 210), ('Liberator', 1, 1000)
+    ]),
+    ('DRAK', 'Drake Interplanetary', [
+        ('Cutlass Black', 30, 110), ('Buccaneer', 8, 110), ('Caterpillar', 10, 330),
+        ('Corsair', 10, 250), ('Vulture', 12, 175), ('Mule', 10, 45),
+        ('Kraken', 2, 1650), ('Ironclad', 2, 450)
+    ]),
+    ('RSI', 'Roberts Space Industries', [
+        ('Aurora MR', 28, 25), ('Mantis', 8, 150), ('Constellation Andromeda', 18, 240),
+        ('Zeus Mk II CL', 8, 150), ('Polaris', 8, 750), ('Galaxy', 4, 450),
+        ('Orion', 3, 650), ('Perseus', 3, 975)
+    ]),
+    ('ORIG', 'Origin Jumpworks', [
+        ('100i', 14, 50), ('300i', 8, 60), ('400i', 6, 250), ('600i Explorer', 8, 435),
+        ('890 Jump', 5, 950), ('M50', 5, 100)
+    ]),
+    ('CRUS', 'Crusader Industries', [
+        ('Mercury Star Runner', 12, 260), ('Ares Inferno', 6, 250), ('C2 Hercules', 8, 400),
+        ('A2 Hercules', 4, 750), ('Hercules M2', 4, 520), ('Spirit C1', 8, 125)
+    ]),
+    ('MISC', 'Musashi Industrial & Starflight Concern', [
+        ('Prospector', 18, 155), ('Freelancer MAX', 10, 150), ('Hull C', 6, 210),
+        ('Starfarer', 8, 300), ('Reliant Kore', 8, 65), ('Odyssey', 2, 700)
+    ]),
+    ('ARGO', 'Argo Astronautics', [
+        ('MPUV Cargo', 8, 35), ('MOLE', 12, 315), ('RAFT', 6, 125), ('SRV', 6, 150)
+    ]),
+    ('CNOU', 'Consolidated Outland', [
+        ('Mustang Alpha', 12, 30), ('Nomad', 8, 80), ('Pioneer', 2, 850)
+    ]),
+    ('BANU', 'Banu', [
+        ('Defender', 6, 220), ('Merchantman', 3, 650)
+    ]),
+    ('ESPR', 'Esperia', [
+        ('Talon', 6, 115), ('Prowler', 4, 440), ('Glaive', 2, 350)
+    ]),
+    ('AOPOA', 'Aopoa', [
+        ('Nox', 4, 45), ("Khartu-Al", 4, 170), ('San\'tok.yai', 3, 220)
+    ]),
+]
+
+# Flattened for weighted sampling: (code, manufacturer, model, price)
+MODELS = [(code, manufacturer, model, price) for code, manufacturer, models in CATALOG for model, _, price in models]
+CUMULATIVE_WEIGHTS = list(itertools.accumulate(
+    popularity for _, _, models in CATALOG for _, popularity, _ in models
+))
+
+# Words custom ship names are built from
+NAME_WORDS = [
+    'Iron', 'Star', 'Void', 'Night', 'Solar', 'Crimson', 'Silent', 'Lucky', 'Last', 'Wandering',
+    'Drake', 'Hawk', 'Runner', 'Hope', 'Fortune', 'Shadow', 'Horizon', 'Tempest', 'Ember', 'Comet'
+]
+
+FIRST_PLEDGE = date(2012, 10, 10)
+LAST_PLEDGE = date(2025, 6, 30)
+LTI_CUTOFF = date(2016, 1, 1)
+
+# Share of ships with a custom name, and of pledges sold as warbonds
+CUSTOM_NAME_RATE = 0.15
+WARBOND_RATE = 0.25
+
+def pick_model(rng: random.Random) -> Tuple[str, str, str, int]:
+    """Pick a ship model weighted by popularity"""
+    return rng.choices(MODELS, cum_weights=CUMULATIVE_WEIGHTS)[0]
+
+def pledge_count(rng: random.Random, mean: float, maximum: int) -> int:
+    """Draw a member's pledge count from a long-tailed distribution"""
+    sigma = 1.0
+    mu = math.log(mean) - sigma ** 2 / 2
+    return max(1, min(maximum, round(rng.lognormvariate(mu, sigma))))
+
+def pledge_date(rng: random.Random) -> date:
+    """Draw a pledge date, weighted towards recent years"""
+    span = (LAST_PLEDGE - FIRST_PLEDGE).days
+    return FIRST_PLEDGE + timedelta(days=int(span * rng.random() ** 0.6))
+
+def make_pledge(rng: random.Random, pledge_id: int) -> List[Dict]:
+    """Build the ship entries of one pledge: a standalone ship or a small pack"""
+    pledged = pledge_date(rng)
+    # Concept-era pledges mostly carry LTI; later ones mostly insurance
+    lti = rng.random() < (0.9 if pledged < LTI_CUTOFF else 0.35)
+    warbond = rng.random() < WARBOND_RATE
+    size = rng.choices((1, 2, 3, 4), weights=(80, 12, 5, 3))[0]
+
+    picks = {}
+    while len(picks) < size:
+        code, manufacturer, model, price = pick_model(rng)
+        picks[f"{code}_{model.replace(' ', '_')}"] = (code, manufacturer, model, price)
+    models = list(picks.values())
+
+    cost = sum(price for _, _, _, price in models) * (0.85 if warbond else 1.0)
+    if size == 1:
+        pledge_name = f"Standalone Ship - {models[0][2]}"
+    else:
+        pledge_name = f"Combo - {' & '.join(model for _, _, model, _ in models)}"
+    if warbond:
+        pledge_name += " Warbond"
+
+    ships = []
+    for ship_code, (code, manufacturer, model, _) in picks.items():
+        ship = {
+            'ship_code': ship_code,
+            'manufacturer_code': code,
+            'manufacturer_name': manufacturer,
+            'lti': lti,
+            'name': model,
+            'warbond': warbond,
+            'entity_type': 'ship',
+            'pledge_id': str(pledge_id),
+            'pledge_name': pledge_name,
+            'pledge_date': pledged.strftime('%B %d, %Y'),
+            'pledge_cost': f"${cost:,.2f} USD"
+        }
+        # XPLOR only exports ship_name for ships the owner has named
+        if rng.random() < CUSTOM_NAME_RATE:
+            ship['ship_name'] = f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)}"
+        ships.append(ship)
+    return ships
+
+def make_hangar(user_id: int, seed: int = 0, mean_pledges: float = 15, max_pledges: int = 200) -> List[Dict]:
+    """Build one member's shiplist, the same every time for a seed and user"""
+    rng = random.Random(f"{seed}:{user_id}")
+    ships = []
+    first_id = 1_000_000 + user_id * 1_000
+    for offset in range(pledge_count(rng, mean_pledges, max_pledges)):
+        ships.extend(make_pledge(rng, first_id + offset))
+    return ships
+
+def make_ships(count: int, seed: int = 0) -> List[Dict]:
+    """Build exactly count ship entries for benchmarks that need a fixed size"""
+    rng = random.Random(seed)
+    ships = []
+    pledge_id = 1_000_000
+    while len(ships) < count:
+        ships.extend(make_pledge(rng, pledge_id))
+        pledge_id += 1
+    return ships[:count]
+
+def make_org(users: int, seed: int = 0, mean_pledges: float = 15,
+             max_pledges: int = 200) -> Iterator[Tuple[int, List[Dict]]]:
+    """Yield (user ID, shiplist) for each member of a synthetic org"""
+    for user_id in range(FIRST_USER_ID, FIRST_USER_ID + users):
+        yield user_id, make_hangar(user_id, seed, mean_pledges, max_pledges)
+
+def write_fixtures(directory: Path, users: int, seed: int = 0, mean_pledges: float = 15,
+                   max_pledges: int = 200) -> int:
+    """Write one shiplist_<user>.json per member, returning the ship count"""
+    directory.mkdir(parents=True, exist_ok=True)
+    total = 0
+    for user_id, ships in make_org(users, seed, mean_pledges, max_pledges):
+        (directory / f"shiplist_{user_id}.json").write_text(json.dumps(ships, indent=2))
+        total += len(ships)
+    return total
+
+async def clear_hangars(conn, users: int):
+    """Remove seeded rows for the reserved user and guild IDs"""
+    user_ids = list(range(FIRST_USER_ID, FIRST_USER_ID + users))
+    async with conn.transaction():
+        await conn.execute('DELETE FROM hangar_ships WHERE user_id = ANY($1)', user_ids)
+        await conn.execute('DELETE FROM hangar_summaries WHERE user_id = ANY($1)', user_ids)
+        for name in ('delete_guild_members', 'delete_guild_aggregates', 'delete_guild_ship_names'):
+            await conn.execute(STATEMENTS[name], BENCH_GUILD_ID)
+
+async def seed_hangars(conn, users: int, seed: int = 0, mean_pledges: float = 15,
+                       max_pledges: int = 200, guild: bool = False, batch_rows: int = 50_000) -> int:
+    """Bulk load a synthetic org into hangar_ships, returning the row count
+
+    Replaces any earlier seed. With guild, every member joins the reserved
+    guild and its fleet aggregates are rebuilt from the seeded rows.
+    """
+    await clear_hangars(conn, users)
+    total = 0
+    async with conn.transaction():
+        batch = []
+        for user_id, ships in make_org(users, seed, mean_pledges, max_pledges):
+            # Collapse duplicate pledges the way an upload does
+            unique = {(ship['ship_code'], ship['pledge_id']): ship for ship in ships}
+            batch.extend(ship_record(user_id, ship) for ship in unique.values())
+            if len(batch) >= batch_rows:
+                await conn.copy_records_to_table('hangar_ships', records=batch, columns=HANGAR_COLUMNS)
+                total += len(batch)
+                batch = []
+        if batch:
+            await conn.copy_records_to_table('hangar_ships', records=batch, columns=HANGAR_COLUMNS)
+            total += len(batch)
+
+        if guild:
+            await conn.copy_records_to_table(
+                'guild_members',
+                records=[(BENCH_GUILD_ID, user_id) for user_id in range(FIRST_USER_ID, FIRST_USER_ID + users)],
+                columns=('guild_id', 'user_id')
+            )
+            await conn.execute(STATEMENTS['rebuild_guild_aggregates'], BENCH_GUILD_ID)
+            await conn.execute(STATEMENTS['rebuild_guild_ship_names'], BENCH_GUILD_ID)
+    return total
+
+async def run(args):
+    """Seed or clear the configured database"""
+    conn = await connect()
+    try:
+        if args.action == 'seed':
+            rows = await seed_hangars(conn, args.users, args.seed, args.mean_pledges, args.max_pledges, args.guild)
+            print(f"Seeded {rows} ships for {args.users} members")
+        else:
+            await clear_hangars(conn, args.users)
+            print(f"Cleared seeded data for {args.users} members")
+    finally:
+        await conn.close()
+
+def main():
+    """Main function to generate, seed or clear synthetic hangars"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('action', choices=('write', 'seed', 'clear'))
+    parser.add_argument('--users', type=int, default=100, help="org size")
+    parser.add_argument('--mean-pledges', type=float, default=15, help="mean pledges per member")
+    parser.add_argument('--max-pledges', type=int, default=200, help="pledge cap per member")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--guild', action='store_true', help="also build the reserved guild's fleet aggregates")
+    parser.add_argument('--out', type=Path, default=Path('fixtures'), help="directory for write")
+    args = parser.parse_args()
+
+    if args.action == 'write':
+        total = write_fixtures(args.out, args.users, args.seed, args.mean_pledges, args.max_pledges)
+        print(f"Wrote {args.users} shiplists ({total} ships) to {args.out}")
+    else:
+        asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
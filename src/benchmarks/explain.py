@@ -0,0 +1,65 @@
+"""
+Check that /forge-locate and /forge-search lookups are served by indexes.
+
+Runs EXPLAIN on the owner lookup and fleet search queries and fails if
+the planner cannot use idx_hangar_ships_model and
+idx_hangar_ships_search. Sequential scans are disabled for the check so
+the result doesn't depend on how many rows the local table holds; the
+plan chosen with default settings is printed for reference.
+"""
+import asyncio
+import json
+import sys
+from typing import Dict, Iterator
+from db.statements import STATEMENTS
+from benchmarks.common import connect
+
+SAMPLE_MODEL = 'Drake Interplanetary Cutlass Black'
+SAMPLE_QUERY = 'cutlas'
+SAMPLE_GUILD_ID = 0
+
+# (label, index, sql, args) for each lookup that must stay indexed
+CHECKS = [
+    ('Owner lookup', 'idx_hangar_ships_model', STATEMENTS['ship_owners'], (SAMPLE_MODEL, SAMPLE_GUILD_ID)),
+    ('Fleet search', 'idx_hangar_ships_search', STATEMENTS['ship_search'], (SAMPLE_QUERY, SAMPLE_GUILD_ID, 50)),
+]
+
+def walk_plan(node: Dict) -> Iterator[Dict]:
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan tree"""
+    yield node
+    for child in node.get('Plans', []):
+        yield from walk_plan(child)
+
+async def explain(conn, sql: str, *args) -> Dict:
+    """Return the root plan node for a query"""
+    result = await conn.fetchval(f'EXPLAIN (FORMAT JSON) {sql}', *args)
+    return json.loads(result)[0]['Plan']
+
+async def check(conn, label: str, index: str, sql: str, args) -> bool:
+    """Check one query, returning True if it uses index"""
+    plan = await explain(conn, sql, *args)
+    print(f"{label} default plan: " + " -> ".join(node['Node Type'] for node in walk_plan(plan)))
+
+    async with conn.transaction():
+        await conn.execute('SET LOCAL enable_seqscan = off')
+        plan = await explain(conn, sql, *args)
+
+    used = any(node.get('Index Name') == index for node in walk_plan(plan))
+    print(f"{label} uses {index}: {'ok' if used else 'FAILED'}")
+    return used
+
+async def run() -> bool:
+    """Run the index checks, returning True if every index is used"""
+    conn = await connect()
+    try:
+        results = [await check(conn, *args) for args in CHECKS]
+        return all(results)
+    finally:
+        await conn.close()
+
+def main():
+    """Main function to run the EXPLAIN regression check"""
+    sys.exit(0 if asyncio.run(run()) else 1)
+
+if __name__ == "__main__":
+    main()
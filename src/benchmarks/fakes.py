@@ -0,0 +1,311 @@
+"""
+In-memory stand-ins for external services used by the benchmark harnesses.
+"""
+import asyncio
+import fnmatch
+import itertools
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+class FakePubSub:
+    """Minimal stand-in for redis.asyncio.client.PubSub"""
+
+    def __init__(self, server: 'FakeRedis'):
+        self.server = server
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.channels: List[str] = []
+
+    async def subscribe(self, *channels: str):
+        """Subscribe to channels"""
+        self.channels.extend(channels)
+        self.server.subscribers.append(self)
+        for channel in channels:
+            self.queue.put_nowait({'type': 'subscribe', 'channel': channel, 'data': 1})
+
+    async def listen(self):
+        """Yield messages until the connection is dropped"""
+        while True:
+            message = await self.queue.get()
+            if isinstance(message, Exception):
+                raise message
+            yield message
+
+    async def aclose(self):
+        """Unsubscribe and release the connection"""
+        if self in self.server.subscribers:
+            self.server.subscribers.remove(self)
+
+class FakeRedis:
+    """Minimal in-memory stand-in for redis.asyncio.Redis
+
+    Supports the string, hash and pub/sub commands FORGE uses, with
+    decode_responses semantics (values come back as str).
+    """
+
+    def __init__(self):
+        self.data: Dict[str, object] = {}
+        self.expiry: Dict[str, float] = {}
+        self.subscribers: List[FakePubSub] = []
+
+    def _alive(self, key: str) -> bool:
+        """Expire a key lazily, returning whether it still exists"""
+        expires_at = self.expiry.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+        return key in self.data
+
+    async def ping(self):
+        return True
+
+    async def get(self, key: str) -> Optional[str]:
+        return self.data.get(key) if self._alive(key) else None
+
+    async def incr(self, key: str) -> int:
+        value = int(await self.get(key) or 0) + 1
+        self.data[key] = str(value)
+        return value
+
+    async def set(self, key: str, value, ex: Optional[int] = None):
+        self.data[key] = value if isinstance(value, (str, bytes)) else str(value)
+        self.expiry.pop(key, None)
+        if ex:
+            await self.expire(key, ex)
+        return True
+
+    async def expire(self, key: str, seconds: int):
+        if not self._alive(key):
+            return False
+        self.expiry[key] = time.monotonic() + seconds
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._alive(key):
+                removed += 1
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+        return removed
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        return dict(self.data.get(key, {})) if self._alive(key) else {}
+
+    async def hset(self, key: str, mapping: Dict):
+        if not self._alive(key):
+            self.data[key] = {}
+        self.data[key].update({k: str(v) for k, v in mapping.items()})
+        return len(mapping)
+
+    async def hmset(self, key: str, mapping: Dict):
+        return await self.hset(key, mapping=mapping)
+
+    async def zadd(self, key: str, mapping: Dict[str, float]) -> int:
+        if not self._alive(key):
+            self.data[key] = {}
+        added = len(set(mapping) - set(self.data[key]))
+        self.data[key].update({member: float(score) for member, score in mapping.items()})
+        return added
+
+    async def zrem(self, key: str, *members: str) -> int:
+        scores = self.data.get(key, {}) if self._alive(key) else {}
+        return sum(scores.pop(member, None) is not None for member in members)
+
+    async def zrange(self, key: str, start: int, end: int, withscores: bool = False) -> List:
+        scores = self.data.get(key, {}) if self._alive(key) else {}
+        ordered = sorted(scores.items(), key=lambda item: (item[1], item[0]))
+        ordered = ordered[start:len(ordered) if end == -1 else end + 1]
+        return ordered if withscores else [member for member, _ in ordered]
+
+    async def keys(self, pattern: str = '*') -> List[str]:
+        return [key for key in list(self.data) if self._alive(key) and fnmatch.fnmatch(key, pattern)]
+
+    async def publish(self, channel: str, message: str) -> int:
+        receivers = [sub for sub in self.subscribers if channel in sub.channels]
+        for sub in receivers:
+            sub.queue.put_nowait({'type': 'message', 'channel': channel, 'data': message})
+        return len(receivers)
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self)
+
+    def pipeline(self, transaction: bool = True) -> 'FakePipeline':
+        return FakePipeline(self)
+
+    def drop_subscribers(self):
+        """Simulate a connection drop for every subscriber"""
+        for sub in list(self.subscribers):
+            sub.queue.put_nowait(ConnectionError("Connection reset by fake server"))
+
+    async def aclose(self):
+        self.subscribers.clear()
+
+class FakePipeline:
+    """Minimal stand-in for redis.asyncio.client.Pipeline
+
+    Queues commands and runs them in order on execute. Commands are
+    applied one at a time, which is atomic within a single event loop.
+    """
+
+    def __init__(self, server: FakeRedis):
+        self.server = server
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.commands.clear()
+
+    def __getattr__(self, name: str):
+        method = getattr(self.server, name)
+
+        def queue(*args, **kwargs):
+            self.commands.append((method, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self) -> List:
+        commands, self.commands = self.commands, []
+        return [await method(*args, **kwargs) for method, args, kwargs in commands]
+
+class FakeMessage:
+    """A sent message that can be deleted"""
+
+    ids = itertools.count(1)
+
+    def __init__(self, content: Optional[str] = None, embed=None, channel_id: int = 0):
+        self.id = next(self.ids)
+        self.channel = SimpleNamespace(id=channel_id)
+        self.jump_url = f"https://discord.com/channels/{channel_id}/{self.id}"
+        self.content = content
+        self.embed = embed
+        self.deleted = False
+
+    async def delete(self):
+        self.deleted = True
+
+class FakeResponse:
+    """Stand-in for discord.InteractionResponse"""
+
+    def __init__(self, interaction: 'FakeInteraction'):
+        self.interaction = interaction
+        self.done = False
+
+    def is_done(self) -> bool:
+        return self.done
+
+    async def defer(self, ephemeral: bool = False, thinking: bool = False):
+        self.done = True
+
+    async def send_message(self, content: Optional[str] = None, embed=None, **kwargs):
+        self.done = True
+        self.interaction.sent.append(FakeMessage(content, embed))
+
+    async def send_modal(self, modal):
+        self.done = True
+        self.interaction.sent.append(FakeMessage(f"<modal {modal.title}>"))
+
+class FakeFollowup:
+    """Stand-in for the interaction followup webhook"""
+
+    def __init__(self, interaction: 'FakeInteraction'):
+        self.interaction = interaction
+
+    async def send(self, content: Optional[str] = None, embed=None, **kwargs) -> FakeMessage:
+        message = FakeMessage(content, embed, self.interaction.channel_id)
+        self.interaction.sent.append(message)
+        return message
+
+class FakeMember:
+    """Stand-in for discord.Member"""
+
+    def __init__(self, user_id: int, display_name: str):
+        self.id = user_id
+        self.name = display_name
+        self.display_name = display_name
+        self.mention = f"<@{user_id}>"
+        self.display_avatar = SimpleNamespace(url=f"https://cdn.example/avatars/{user_id}.png")
+
+class FakeGuild:
+    """Stand-in for a fully chunked discord.Guild"""
+
+    def __init__(self, guild_id: int, name: str, members: List[FakeMember]):
+        self.id = guild_id
+        self.name = name
+        self.members = members
+        self.member_count = len(members)
+        self.chunked = True
+        self.by_id = {member.id: member for member in members}
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self.by_id.get(user_id)
+
+class FakeInteraction:
+    """Stand-in for discord.Interaction, recording everything sent"""
+
+    ids = itertools.count(1)
+
+    def __init__(self, user: FakeMember, guild: Optional[FakeGuild] = None):
+        self.id = next(self.ids)
+        self.user = user
+        self.guild = guild
+        self.guild_id = guild.id if guild else None
+        self.channel_id = self.guild_id or user.id
+        self.command = None
+        self.extras: Dict = {}
+        self.sent: List[FakeMessage] = []
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def delete_original_response(self):
+        pass
+
+class FakeAttachment:
+    """Stand-in for discord.Attachment whose bytes are served by FakeSession"""
+
+    def __init__(self, filename: str, data: bytes):
+        self.filename = filename
+        self.size = len(data)
+        self.url = f"https://cdn.example/attachments/{id(self)}/{filename}"
+        self.data = data
+
+class FakeStream:
+    """Stand-in for aiohttp's StreamReader"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def iter_chunked(self, size: int):
+        for start in range(0, len(self.data), size):
+            yield self.data[start:start + size]
+
+class FakeHTTPResponse:
+    def __init__(self, data: bytes):
+        self.content = FakeStream(data)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+class FakeSession:
+    """Stand-in for aiohttp.ClientSession serving registered attachments"""
+
+    def __init__(self):
+        self.files: Dict[str, bytes] = {}
+
+    def attach(self, attachment: FakeAttachment) -> FakeAttachment:
+        self.files[attachment.url] = attachment.data
+        return attachment
+
+    def get(self, url: str) -> FakeHTTPResponse:
+        return FakeHTTPResponse(self.files[url])
+
+    async def close(self):
+        pass
@@ -0,0 +1,60 @@
+"""
+Compare per-row INSERT and bulk COPY ingest of hangar data.
+
+Each run happens inside a transaction that is rolled back, so the
+benchmark leaves no rows behind. Requires a local PostgreSQL configured
+through env/.env with the hangar_ships table created.
+"""
+import asyncio
+import statistics
+from db.database import Database, ship_record
+from db.statements import STATEMENTS, StatementConnection
+from benchmarks.common import BENCH_USER_ID, Timer, connect
+from benchmarks.dataset import make_ships
+
+SIZES = (10, 100, 1000)
+ROUNDS = 5
+
+async def per_row_insert(conn, records):
+    """Legacy ingest path: one INSERT round trip per ship"""
+    for record in records:
+        await conn.execute(STATEMENTS['insert_hangar_ships'], *record)
+
+async def bulk_insert(conn, records):
+    """Bulk ingest path used by Database.save_hangar_data"""
+    db = Database(pool=None, cache=None)
+    await db.bulk_insert_ships(StatementConnection(conn, db.query_ms), records)
+
+async def time_method(conn, method, records) -> float:
+    """Run one ingest inside a rolled back transaction and return elapsed ms"""
+    tr = conn.transaction()
+    await tr.start()
+    try:
+        await conn.execute('DELETE FROM hangar_ships WHERE user_id = $1', BENCH_USER_ID)
+        with Timer() as timer:
+            await method(conn, records)
+        return timer.elapsed_ms
+    finally:
+        await tr.rollback()
+
+async def run():
+    """Run the ingest benchmark and print a summary table"""
+    conn = await connect()
+    try:
+        print(f"{'ships':>6} {'per-row ms':>12} {'bulk ms':>10} {'speedup':>8}")
+        for size in SIZES:
+            records = [ship_record(BENCH_USER_ID, ship) for ship in make_ships(size)]
+            per_row = [await time_method(conn, per_row_insert, records) for _ in range(ROUNDS)]
+            bulk = [await time_method(conn, bulk_insert, records) for _ in range(ROUNDS)]
+            per_row_ms = statistics.median(per_row)
+            bulk_ms = statistics.median(bulk)
+            print(f"{size:>6} {per_row_ms:>12.2f} {bulk_ms:>10.2f} {per_row_ms / bulk_ms:>7.1f}x")
+    finally:
+        await conn.close()
+
+def main():
+    """Main function to run the ingest benchmark"""
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
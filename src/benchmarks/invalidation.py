@@ -0,0 +1,81 @@
+"""
+Exercise the cross-replica cache invalidation bus.
+
+Runs two replicas' InvalidationBus instances against an in-memory Redis
+stand-in, checks that invalidations published by one replica evict the
+other's local cache, that a reconnect resyncs the local cache, and
+reports propagation latency.
+"""
+import asyncio
+import statistics
+import sys
+import time
+from benchmarks.fakes import FakeRedis
+from utils.cache import LocalCache
+from utils.invalidation import InvalidationBus
+
+ROUNDS = 1000
+
+async def wait_for(condition, timeout: float = 5.0):
+    """Poll until a condition holds, raising on timeout"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Condition not met in time")
+        await asyncio.sleep(0)
+
+async def run() -> bool:
+    """Run the invalidation checks, returning True if all passed"""
+    server = FakeRedis()
+    replicas = []
+    for _ in range(2):
+        local = LocalCache()
+        bus = InvalidationBus(server, local)
+        bus.start()
+        replicas.append((local, bus))
+    (local_a, bus_a), (local_b, bus_b) = replicas
+    ok = True
+
+    try:
+        await wait_for(lambda: bus_a.connected and bus_b.connected)
+
+        # Propagation: A publishes, B evicts
+        latencies = []
+        for i in range(ROUNDS):
+            key = f"hangar:{i}"
+            local_a.set(key, [], size=2)
+            local_b.set(key, [], size=2)
+            start = time.perf_counter()
+            await bus_a.publish(key)
+            await wait_for(lambda: key not in local_b.entries)
+            latencies.append((time.perf_counter() - start) * 1_000_000)
+
+        # A ignores its own messages (it evicts locally before publishing)
+        own_ok = len(local_a.entries) == ROUNDS
+        ok &= own_ok
+        print(f"Origin filtering: {'ok' if own_ok else 'FAILED'}")
+
+        ordered = sorted(latencies)
+        print(f"Propagation over {ROUNDS} invalidations: "
+              f"p50 {statistics.median(ordered):.1f} us, "
+              f"p99 {ordered[int(len(ordered) * 0.99)]:.1f} us")
+
+        # Reconnect: B must resync by clearing its local tier
+        local_b.set("fleet_total", {}, size=2)
+        server.drop_subscribers()
+        await wait_for(lambda: bus_b.reconnects > 0 and bus_b.connected, timeout=10)
+        resync_ok = "fleet_total" not in local_b.entries
+        ok &= resync_ok
+        print(f"Resync on reconnect: {'ok' if resync_ok else 'FAILED'}")
+    finally:
+        await bus_a.stop()
+        await bus_b.stop()
+
+    return ok
+
+def main():
+    """Main function to run the invalidation harness"""
+    sys.exit(0 if asyncio.run(run()) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Drive the FORGE cogs under concurrent load without Discord.
+
+Builds a synthetic org, then invokes the real command callbacks with fake
+interactions, members and attachments: every member uploads a hangar,
+then a seeded mix of /forge-hangar, /forge-fleet, /forge-locate and
+/forge system runs at a fixed concurrency. Reports p50/p95/p99 latency
+and throughput per command.
+
+Requires a local PostgreSQL configured through env/.env. Redis is used
+too unless --fake-redis is given. Rows are written for reserved user and
+guild IDs below any real Discord snowflake and removed afterwards.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+from benchmarks.common import load_env
+from benchmarks.dataset import BENCH_GUILD_ID, FIRST_USER_ID, make_hangar
+from benchmarks.fakes import FakeAttachment, FakeGuild, FakeInteraction, FakeMember, FakeRedis, FakeSession
+from cogs.hangar import Hangar
+from cogs.system import ForgeCog
+from db.database import Database, init_db, init_redis
+from utils.constants import COLOR_ERROR
+from utils.deletions import DeletionScheduler
+from utils.executor import WorkPool
+from utils.members import MemberDirectory
+from utils.outbound import Outbound
+
+# Relative frequency of each read command in the mixed phase
+COMMAND_MIX = {'forge-hangar': 40, 'forge-locate': 25, 'forge-fleet': 20, 'forge system': 15}
+
+class FakeBot:
+    """The parts of DraXonFORGE the cogs use"""
+
+    def __init__(self, db: Database, members: MemberDirectory, work_pool: WorkPool):
+        self.db = db
+        self.members = members
+        self.work_pool = work_pool
+        self.tree = SimpleNamespace(add_command=lambda command: None)
+        # Never started, and kept off the real Redis so no real deletes are queued
+        self.deletions = DeletionScheduler(http=None, cache=FakeRedis())
+        self.outbound = Outbound()
+        self.latency = 0.0
+
+def make_org(size: int, mean_pledges: float, seed: int) -> Tuple[FakeGuild, Dict[int, bytes]]:
+    """Build a guild of members and each member's shiplist.json"""
+    members = [FakeMember(FIRST_USER_ID + i, f"Member {i:04d}") for i in range(size)]
+    exports = {
+        member.id: json.dumps(make_hangar(member.id, seed, mean_pledges)).encode()
+        for member in members
+    }
+    return FakeGuild(BENCH_GUILD_ID, "Load Test Org", members), exports
+
+def failed(interaction: FakeInteraction) -> bool:
+    """Whether a command sent nothing or reported an error"""
+    if not interaction.sent:
+        return True
+    return any(m.embed is not None and m.embed.color and m.embed.color.value == COLOR_ERROR for m in interaction.sent)
+
+async def run_phase(jobs: List[Tuple[str, object]], concurrency: int) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    """Run (command, coroutine factory) jobs, returning latencies, errors and wall time"""
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    limit = asyncio.Semaphore(concurrency)
+
+    async def run_job(command: str, job):
+        async with limit:
+            start = time.perf_counter()
+            interaction = await job()
+            latencies.setdefault(command, []).append((time.perf_counter() - start) * 1000)
+            errors[command] = errors.get(command, 0) + failed(interaction)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_job(command, job) for command, job in jobs))
+    return latencies, errors, time.perf_counter() - start
+
+def report(latencies: Dict[str, List[float]], errors: Dict[str, int], elapsed: float):
+    """Print one row of latency percentiles and throughput per command"""
+    for command, timings in sorted(latencies.items()):
+        cuts = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+        print(f"{command:<16}{len(timings):>8}{errors[command]:>8}"
+              f"{cuts[49]:>10.1f}{cuts[94]:>10.1f}{cuts[98]:>10.1f}{len(timings) / elapsed:>10.1f}")
+
+async def cleanup(db: Database, user_ids: List[int]):
+    """Remove every row and cache entry the load test created"""
+    async with db.pool.acquire() as conn:
+        await conn.execute('DELETE FROM hangar_ships WHERE user_id = ANY($1)', user_ids)
+        await conn.execute('DELETE FROM hangar_summaries WHERE user_id = ANY($1)', user_ids)
+        await conn.execute('DELETE FROM system_info WHERE user_id = ANY($1)', user_ids)
+    await db.remove_guild(BENCH_GUILD_ID)
+    for user_id in user_ids:
+        await db.invalidate(f"hangar:{user_id}", f"hangar_summary:{user_id}", f"system_info:{user_id}")
+
+async def run(args):
+    """Set up the services and cogs, run both phases and print the results"""
+    load_env()
+    db_url = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@" \
+             f"{os.getenv('DB_HOST', 'localhost')}:{os.getenv('DB_PORT', '5432')}/" \
+             f"{os.getenv('DB_NAME')}"
+    pool = await init_db(db_url, max_size=args.pool_size)
+    if args.fake_redis:
+        cache = blobs = FakeRedis()
+    else:
+        redis_url = f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', '6379')}/" \
+                    f"{os.getenv('REDIS_DB', '0')}"
+        cache = await init_redis(redis_url)
+        blobs = await init_redis(redis_url, decode_responses=False)
+
+    work_pool = WorkPool()
+    db = Database(pool, cache, work_pool=work_pool, blobs=blobs)
+    db.bus.start()
+    members = MemberDirectory(db)
+    bot = FakeBot(db, members, work_pool)
+    bot.outbound.start()
+    hangar = Hangar(bot)
+    hangar.session = session = FakeSession()
+    system = ForgeCog(bot)
+
+    guild, exports = make_org(args.members, args.pledges, args.seed)
+    user_ids = [member.id for member in guild.members]
+    rng = random.Random(args.seed)
+    try:
+        await members.sync_guild(guild)
+        for member in guild.members:
+            await db.save_system_info(member.id, 'Windows 11', 'Ryzen 7 7800X3D', 'RTX 4080', '64 GB', '2 TB NVMe')
+
+        def command(callback, cog, *params, member=None):
+            """Wrap one command invocation, run as a random member by default"""
+            member = member or rng.choice(guild.members)
+
+            async def job():
+                interaction = FakeInteraction(member, guild)
+                await callback(cog, interaction, *params)
+                return interaction
+            return job
+
+        uploads = [
+            ('forge-upload', command(
+                Hangar.forge_upload.callback, hangar,
+                session.attach(FakeAttachment('shiplist.json', exports[member.id])), member=member
+            ))
+            for member in guild.members
+        ]
+
+        models = sorted({
+            f"{ship['manufacturer_name']} {ship['name']}"
+            for data in exports.values() for ship in json.loads(data)
+        })
+        factories = {
+            'forge-hangar': lambda: command(Hangar.forge_hangar.callback, hangar, rng.choice(guild.members)),
+            'forge-fleet': lambda: command(Hangar.forge_fleet.callback, hangar),
+            'forge-locate': lambda: command(Hangar.forge_locate.callback, hangar, rng.choice(models)),
+            'forge system': lambda: command(ForgeCog.system.callback, system, rng.choice(guild.members)),
+        }
+        names = rng.choices(list(COMMAND_MIX), weights=list(COMMAND_MIX.values()), k=args.requests)
+        reads = [(name, factories[name]()) for name in names]
+
+        print(f"{args.members} members, ~{args.pledges:g} pledges each, concurrency {args.concurrency}"
+              f"{', fake Redis' if args.fake_redis else ''}")
+        print(f"{'command':<16}{'runs':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'per s':>10}")
+        report(*await run_phase(uploads, args.concurrency))
+        report(*await run_phase(reads, args.concurrency))
+    finally:
+        await bot.outbound.stop()
+        await cleanup(db, user_ids)
+        await db.close()
+        work_pool.shutdown()
+
+def main():
+    """Main function to run the load test"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--members', type=int, default=200, help="org size")
+    parser.add_argument('--pledges', type=float, default=15, help="mean pledges per member")
+    parser.add_argument('--requests', type=int, default=2000, help="read commands in the mixed phase")
+    parser.add_argument('--concurrency', type=int, default=20, help="commands in flight at once")
+    parser.add_argument('--pool-size', type=int, default=10, help="database pool size")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fake-redis', action='store_true', help="use the in-memory Redis stand-in")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
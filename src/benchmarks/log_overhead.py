@@ -0,0 +1,71 @@
+"""
+Measure the logging overhead one hangar or fleet command adds.
+
+Compares the old pattern, eager f-strings dumping whole hangars and one
+INFO line per fleet row through a synchronous handler, with the current
+one: lazy DEBUG calls gated by level and sampling, written as JSON by a
+queue listener thread. Times only the command's own thread, which is
+what the event loop pays. Runs entirely in process; no services needed.
+"""
+import logging
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List
+from benchmarks.dataset import make_ships
+from benchmarks.serializers import make_fleet
+from utils.log import setup_logging
+
+SIZES = (100, 1000)
+ROUNDS = 200
+
+logger = logging.getLogger('DraXon_FORGE.bench')
+
+def before(ships: List[Dict], fleet: Dict[str, Dict]):
+    """Log calls a hangar and fleet command made before structured logging"""
+    logger.info(f"Retrieved hangar data: {ships}")
+    logger.info(f"Fleet query returned {len(fleet)} rows")
+    for name, data in fleet.items():
+        logger.info(f"Added fleet data for {name}: {data}")
+    logger.info(f"Retrieved fleet data: {fleet}")
+
+def after(ships: List[Dict], fleet: Dict[str, Dict]):
+    """Log calls the same commands make now"""
+    logger.debug("Fleet query returned %d rows", len(fleet), extra={'guild_id': 1, 'sample_every': 100})
+    logger.info("Saved hangar for user %s: %s", 1, {'added': 1}, extra={'user_id': 1})
+
+def time_command(command: Callable, ships: List[Dict], fleet: Dict[str, Dict]) -> float:
+    """Return the median time one command spends logging, in microseconds"""
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        command(ships, fleet)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(timings)
+
+def main():
+    """Main function to run the logging overhead benchmark"""
+    results = {size: [] for size in SIZES}
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'before.log'), 'w') as sink:
+            logging.basicConfig(level=logging.INFO, stream=sink, force=True)
+            for size in SIZES:
+                ships = make_ships(size, seed=size)
+                results[size].append(time_command(before, ships, make_fleet(ships)))
+
+        with open(os.path.join(tmp, 'after.log'), 'w') as sink:
+            listener = setup_logging(level='INFO', stream=sink)
+            try:
+                for size in SIZES:
+                    ships = make_ships(size, seed=size)
+                    results[size].append(time_command(after, ships, make_fleet(ships)))
+            finally:
+                listener.stop()
+
+    print(f"{'ships':>8}{'before µs':>14}{'after µs':>14}")
+    for size, (old, new) in results.items():
+        print(f"{size:>8}{old:>14.1f}{new:>14.1f}")
+
+if __name__ == "__main__":
+    main()
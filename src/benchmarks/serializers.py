@@ -0,0 +1,77 @@
+"""
+Compare cache encodings for hangar and fleet values.
+
+Reports the bytes each encoding stores in Redis and the time to decode
+one cache hit, against the plain JSON format used before versioned
+encodings. Runs entirely in process; no services needed.
+"""
+import json
+import statistics
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+from benchmarks.dataset import make_ships
+from utils.serializers import CacheSerializer, msgpack
+
+SIZES = (100, 1000)
+ROUNDS = 200
+
+def make_fleet(ships: List[Dict]) -> Dict[str, Dict]:
+    """Build a fleet_total style value from a list of ships"""
+    fleet = defaultdict(lambda: {
+        'manufacturer_name': None, 'count': 0, 'lti_count': 0,
+        'warbond_count': 0, 'custom_names': None
+    })
+    for ship in ships:
+        data = fleet[ship['name']]
+        data['manufacturer_name'] = ship['manufacturer_name']
+        data['count'] += 1
+        data['lti_count'] += ship['lti']
+        data['warbond_count'] += ship['warbond']
+    return dict(fleet)
+
+def encodings() -> Dict[str, tuple]:
+    """Return (dumps, loads) pairs for every encoding to compare"""
+    candidates = {
+        'json (legacy)': (lambda value: json.dumps(value).encode(), json.loads),
+        'json': CacheSerializer('json'),
+        'json+zlib': CacheSerializer('json', compress_threshold=0),
+    }
+    if msgpack is not None:
+        candidates['columnar msgpack'] = CacheSerializer('msgpack')
+        candidates['columnar msgpack+zlib'] = CacheSerializer('msgpack', compress_threshold=0)
+    return {
+        name: (codec.dumps, codec.loads) if isinstance(codec, CacheSerializer) else codec
+        for name, codec in candidates.items()
+    }
+
+def time_decode(loads: Callable, raw: bytes) -> float:
+    """Return the median decode time in microseconds"""
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        loads(raw)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(timings)
+
+def main():
+    """Main function to run the serializer benchmark"""
+    print(f"{'value':<16}{'encoding':<24}{'bytes':>10}{'decode µs':>12}")
+    for size in SIZES:
+        # Cached hangars are database rows, where ship_name is always set
+        ships = [dict(ship, ship_name=ship.get('ship_name', ship['name'])) for ship in make_ships(size, seed=size)]
+        values = {
+            f"hangar ({size})": ships,
+            f"fleet ({size})": make_fleet(ships),
+        }
+        for label, value in values.items():
+            for name, (dumps, loads) in encodings().items():
+                raw = dumps(value)
+                assert loads(raw) == value, f"{name} did not round trip"
+                print(f"{label:<16}{name:<24}{len(raw):>10}{time_decode(loads, raw):>12.1f}")
+        print()
+    if msgpack is None:
+        print("msgpack not installed; msgpack encodings skipped")
+
+if __name__ == "__main__":
+    main()
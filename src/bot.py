@@ -1,20 +1,39 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 import os
 import logging
+import math
+import time
 import asyncpg
 import redis.asyncio as redis
 from dotenv import load_dotenv
 from utils.constants import *
 from db.database import Database, init_db, init_redis
+from utils.serializers import DEFAULT_CODEC, CacheSerializer
+from utils.executor import LoopLagMonitor, WorkPool
+from utils.members import MemberDirectory
+from utils.metrics import MetricsServer, Registry, elapsed_ms
+from utils.log import queue_handler, setup_logging
+from utils.deletions import DeletionScheduler
+from utils.outbound import Outbound
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('DraXon_FORGE')
 
 # Load environment variables from env directory
 load_dotenv('../env/.env')
 
+class TimedCommandTree(app_commands.CommandTree):
+    """Command tree that records how long each slash command takes"""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interaction.extras['started'] = time.perf_counter()
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        self.client.observe_command(interaction, 'error')
+        await super().on_error(interaction, error)
+
 class DraXonFORGE(commands.Bot):
     def __init__(self):
         intents = discord.Intents.default()
@@ -26,12 +45,43 @@ class DraXonFORGE(commands.Bot):
             intents=intents,
             help_command=None,
             description=BOT_DESCRIPTION,
-            application_id=os.getenv('APPLICATION_ID')
+            application_id=os.getenv('APPLICATION_ID'),
+            tree_cls=TimedCommandTree
         )
         
         self.db_pool = None
         self.redis_pool = None
+        self.redis_blobs = None
         self.db = None
+        self.members = None
+        self.deletions = None
+        self.outbound = None
+        
+        # Pool for CPU-bound parse and render jobs, kept off the event loop
+        self.work_pool = WorkPool(
+            kind=os.getenv('WORK_POOL_KIND', 'thread'),
+            workers=int(os.getenv('WORK_POOL_WORKERS', '0')) or None
+        )
+        
+        # Metrics served on /metrics, recorded throughout the bot
+        self.metrics = Registry()
+        self.command_ms = self.metrics.histogram(
+            'forge_command_milliseconds', 'Slash command latency', labels=('command', 'status')
+        )
+        self.metrics.callback(
+            'forge_gateway_latency_milliseconds', 'Discord gateway heartbeat latency',
+            lambda: 0.0 if math.isnan(self.latency) else self.latency * 1000
+        )
+        self.metrics_server = None
+        log_queue = queue_handler()
+        if log_queue:
+            self.metrics.callback(
+                'forge_log_records_dropped_total', 'Log records dropped because the log queue was full',
+                lambda: log_queue.dropped, kind='counter'
+            )
+        self.loop_monitor = LoopLagMonitor(lag_ms=self.metrics.histogram(
+            'forge_event_loop_lag_milliseconds', 'How late the event loop wakes from a fixed sleep'
+        )[()])
 
     async def setup_hook(self):
         """Setup hook for loading cogs and syncing commands"""
@@ -58,13 +108,54 @@ class DraXonFORGE(commands.Bot):
                        f"{os.getenv('REDIS_DB', '0')}"
             
             # Initialize connections
-            self.db_pool = await init_db(db_url)
+            self.db_pool = await init_db(
+                db_url,
+                min_size=int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+                max_size=int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+                max_inactive_connection_lifetime=float(os.getenv('DB_POOL_MAX_INACTIVE', '300')),
+                statement_cache_size=int(os.getenv('DB_STATEMENT_CACHE_SIZE', '256')),
+                statement_timeout_ms=int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '15000'))
+            )
             self.redis_pool = await init_redis(redis_url)
+            self.redis_blobs = await init_redis(redis_url, decode_responses=False)
+            
+            # Cache encoding: msgpack when installed, else json, zlib compressed past a size
+            compress_bytes = os.getenv('CACHE_COMPRESS_BYTES')
+            serializer = CacheSerializer(
+                codec=os.getenv('CACHE_CODEC', DEFAULT_CODEC),
+                compress_threshold=int(compress_bytes) if compress_bytes else None
+            )
             
             # Create database interface
-            self.db = Database(self.db_pool, self.redis_pool)
+            self.db = Database(
+                self.db_pool, self.redis_pool, work_pool=self.work_pool,
+                blobs=self.redis_blobs, serializer=serializer, metrics=self.metrics
+            )
             logger.info("Database and Redis connections established")
             
+            # Guild member IDs and display names, kept fresh from member events
+            self.members = MemberDirectory(self.db)
+            
+            # Rate-limited queue for followups and deletes, replies first
+            self.outbound = Outbound(self.http, metrics=self.metrics)
+            self.outbound.start()
+            
+            # Timed message deletions, persisted in Redis across restarts
+            self.deletions = DeletionScheduler(self.outbound, self.redis_pool, metrics=self.metrics)
+            self.deletions.start()
+            
+            # Start cross-replica cache invalidation and loop lag monitoring
+            self.db.bus.start()
+            self.loop_monitor.start()
+            
+            # Local metrics endpoint, disabled with METRICS_PORT=0
+            metrics_port = int(os.getenv('METRICS_PORT', '9108'))
+            if metrics_port:
+                self.metrics_server = MetricsServer(
+                    self.metrics, host=os.getenv('METRICS_HOST', '127.0.0.1'), port=metrics_port
+                )
+                await self.metrics_server.start()
+            
             # Load all cogs
             logger.info("Loading cogs...")
             await self.load_extension('cogs.system')
@@ -84,10 +175,29 @@ class DraXonFORGE(commands.Bot):
     async def close(self):
         """Cleanup when bot is shutting down"""
         logger.info("Bot shutting down...")
+        await self.loop_monitor.stop()
+        if self.deletions:
+            await self.deletions.stop()
+        if self.outbound:
+            await self.outbound.stop()
+        if self.metrics_server:
+            await self.metrics_server.stop()
         if self.db:
             await self.db.close()
+        self.work_pool.shutdown()
         await super().close()
 
+    def observe_command(self, interaction: discord.Interaction, status: str):
+        """Record a finished slash command's latency"""
+        started = interaction.extras.get('started')
+        if started is None or interaction.command is None:
+            return
+        self.command_ms[interaction.command.qualified_name, status].observe(elapsed_ms(started))
+
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        """Record latency for commands that returned normally"""
+        self.observe_command(interaction, 'ok')
+
     async def create_bot_role(self, guild: discord.Guild) -> None:
         """Create bot role in guild if it doesn't exist"""
         bot_role = discord.utils.get(guild.roles, name="DraXon FORGE")
@@ -107,6 +217,34 @@ class DraXonFORGE(commands.Bot):
         """Handle bot joining a new guild"""
         logger.info(f"Joined new guild: {guild.name}")
         await self.create_bot_role(guild)
+        await self.members.sync_guild(guild)
+
+    async def on_guild_remove(self, guild: discord.Guild):
+        """Drop fleet data for a guild the bot has left"""
+        logger.info(f"Removed from guild: {guild.name}")
+        await self.members.remove_guild(guild.id)
+
+    async def on_member_join(self, member: discord.Member):
+        """Count a new member's hangar towards the guild fleet"""
+        await self.members.member_joined(member)
+
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        """Remove a departed member's hangar from the guild fleet, cached or not"""
+        await self.members.member_left(payload.guild_id, payload.user.id)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """Keep display names current when a nickname changes"""
+        if before.display_name != after.display_name:
+            self.members.rename(after.guild.id, after.id, after.display_name)
+
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        """Keep display names current when a global name changes"""
+        if before.display_name == after.display_name:
+            return
+        for guild in after.mutual_guilds:
+            member = guild.get_member(after.id)
+            if member:
+                self.members.rename(guild.id, member.id, member.display_name)
 
     async def on_ready(self):
         """Event handler for when the bot is ready"""
@@ -114,9 +252,10 @@ class DraXonFORGE(commands.Bot):
         logger.info(f'Bot Version: {APP_VERSION}')
         logger.info(f'Build Date: {BUILD_DATE}')
         
-        # Create bot role in each guild if it doesn't exist
+        # Create bot role in each guild if it doesn't exist, and sync members
         for guild in self.guilds:
             await self.create_bot_role(guild)
+            await self.members.sync_guild(guild)
         
         # Print guilds the bot is in
         guilds = [guild.name for guild in self.guilds]
@@ -129,22 +268,33 @@ class DraXonFORGE(commands.Bot):
 
 def main():
     """Main function to run the bot"""
-    token = os.getenv('DISCORD_TOKEN')
-    if not token:
-        logger.error(MSG_ERROR_TOKEN)
-        return
-    
-    app_id = os.getenv('APPLICATION_ID')
-    if not app_id:
-        logger.error("Error: APPLICATION_ID environment variable not set")
-        return
-    
     debug = os.getenv('DEBUG', 'false').lower() == 'true'
-    if debug:
-        logger.info("Debug mode enabled")
+    log_listener = setup_logging(
+        level='DEBUG' if debug else os.getenv('LOG_LEVEL', 'INFO'),
+        module_levels=os.getenv('LOG_LEVELS', 'discord=WARNING'),
+        fmt=os.getenv('LOG_FORMAT', 'json')
+    )
     
-    bot = DraXonFORGE()
-    bot.run(token)
+    try:
+        token = os.getenv('DISCORD_TOKEN')
+        if not token:
+            logger.error(MSG_ERROR_TOKEN)
+            return
+        
+        app_id = os.getenv('APPLICATION_ID')
+        if not app_id:
+            logger.error("Error: APPLICATION_ID environment variable not set")
+            return
+        
+        if debug:
+            logger.info("Debug mode enabled")
+        
+        bot = DraXonFORGE()
+        # Our queue handler replaces discord.py's own log setup
+        bot.run(token, log_handler=None)
+    finally:
+        # Flush queued records before exiting
+        log_listener.stop()
 
 if __name__ == "__main__":
     main()
@@ -3,12 +3,17 @@ from discord import app_commands
 from discord.ext import commands
 from typing import Optional, List
 from utils.constants import *
+from db.database import has_changes
+from utils.cache import LocalCache
+from utils.paginator import send_pages, share_pages
+from utils.render import Pages, fleet_lines, summary_lines
+from utils.search import ModelIndexes
+from utils.xplor import ShiplistParser
+import aiohttp
 import json
-import asyncio
 import logging
-from collections import defaultdict
 
-logger = logging.getLogger('DraXon_FORGE')
+logger = logging.getLogger('DraXon_FORGE.hangar')
 
 def format_ship_status(lti: bool, warbond: bool) -> str:
     """Format ship status indicators"""
@@ -33,6 +38,26 @@ class Hangar(commands.Cog):
             callback=self.view_hangar_context_menu,
         )
         self.bot.tree.add_command(self.context_menu)
+        self.session = None
+
+        # Laid out pages, keyed by the data version they were built from
+        self.page_cache = LocalCache(max_entries=256, default_ttl=600)
+
+        # Ship model indexes that serve /forge-locate autocomplete
+        self.models = ModelIndexes(
+            loader=self.bot.db.get_all_ship_models,
+            versioner=lambda guild_id: self.bot.db.get_data_version(f"fleet_ships:{guild_id}"),
+            refresh_interval=MODEL_INDEX_REFRESH
+        )
+
+    async def cog_load(self):
+        """Open the HTTP session used to stream attachments"""
+        self.session = aiohttp.ClientSession()
+
+    async def cog_unload(self):
+        """Close the attachment HTTP session"""
+        if self.session:
+            await self.session.close()
 
     @app_commands.command(name="forge-debug", description="Debug database state")
     @app_commands.default_permissions(administrator=True)
@@ -41,39 +66,67 @@ class Hangar(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         
         try:
-            async with self.bot.db.pool.acquire() as conn:
-                ship_count = await conn.fetchval('SELECT COUNT(*) FROM hangar_ships')
-                user_count = await conn.fetchval('SELECT COUNT(DISTINCT user_id) FROM hangar_ships')
-                manu_count = await conn.fetchval('SELECT COUNT(DISTINCT manufacturer_name) FROM hangar_ships')
-                sample = await conn.fetch('SELECT * FROM hangar_ships LIMIT 1')
-                
-                debug_info = [
-                    "```md",
-                    "# Database Debug Info",
+            stats = await self.bot.db.get_debug_stats()
+            
+            debug_info = [
+                "```md",
+                "# Database Debug Info",
+                "",
+                f"* Total ships: {stats['ship_count']}",
+                f"* Unique users: {stats['user_count']}",
+                f"* Manufacturers: {stats['manufacturer_count']}",
+            ]
+            
+            # Event loop health
+            lag = self.bot.loop_monitor.stats()
+            debug_info.extend([
+                "",
+                "# Event Loop",
+                f"* Heartbeat latency: {self.bot.latency * 1000:.1f} ms",
+                f"* Loop lag (last/p95/max): {lag['last_ms']:.1f} / {lag['p95_ms']:.1f} / {lag['max_ms']:.1f} ms",
+            ])
+            
+            # Local cache tier
+            cache = self.bot.db.local.stats()
+            debug_info.extend([
+                "",
+                "# Local Cache",
+                f"* Entries: {cache['entries']} ({cache['bytes'] // 1024} KB)",
+                f"* Hits/misses: {cache['hits']} / {cache['misses']}",
+                f"* Evictions: {cache['evictions']}",
+                f"* Coalesced misses: {self.bot.db.flights.coalesced}",
+            ])
+            
+            # Connection pool
+            pool = self.bot.db.get_pool_stats()
+            acquire = pool['acquire']
+            debug_info.extend([
+                "",
+                "# Connection Pool",
+                f"* Connections: {pool['size']} ({pool['idle']} idle, {pool['min_size']}-{pool['max_size']})",
+                f"* Acquire wait (p50/p95/max): {acquire['p50']:.1f} / {acquire['p95']:.1f} / {acquire['max']:.1f} ms",
+            ])
+            for name, timing in pool['slowest']:
+                debug_info.append(f"* {name}: p95 {timing['p95']:.1f} ms over {timing['count']} runs")
+            
+            sample = stats['sample']
+            if sample:
+                debug_info.extend([
                     "",
-                    f"* Total ships: {ship_count}",
-                    f"* Unique users: {user_count}",
-                    f"* Manufacturers: {manu_count}",
-                ]
-                
-                if sample:
-                    ship = dict(sample[0])
-                    debug_info.extend([
-                        "",
-                        "# Sample Ship Data",
-                        f"* Code: {ship['ship_code']}",
-                        f"* Name: {ship['name']}",
-                        f"* Manufacturer: {ship['manufacturer_name']}",
-                        f"* User ID: {ship['user_id']}"
-                    ])
-                else:
-                    debug_info.append("\n[No ships found in database]")
-                
-                debug_info.append("```")
-                await interaction.followup.send("\n".join(debug_info), ephemeral=True)
+                    "# Sample Ship Data",
+                    f"* Code: {sample['ship_code']}",
+                    f"* Name: {sample['name']}",
+                    f"* Manufacturer: {sample['manufacturer_name']}",
+                    f"* User ID: {sample['user_id']}"
+                ])
+            else:
+                debug_info.append("\n[No ships found in database]")
+            
+            debug_info.append("```")
+            await self.bot.outbound.followup(interaction, "\n".join(debug_info), ephemeral=True)
         except Exception as e:
             logger.error(f"Error in forge-debug: {str(e)}")
-            await interaction.followup.send(f"Error: {str(e)}", ephemeral=True)
+            await self.bot.outbound.followup(interaction, f"Error: {str(e)}", ephemeral=True)
 
     @app_commands.command(name="forge-upload", description=CMD_UPLOAD_DESC)
     @app_commands.describe(file="Your shiplist.json file from XPLOR addon")
@@ -83,30 +136,67 @@ class Hangar(commands.Cog):
 
         try:
             if not file.filename.endswith('.json'):
-                await interaction.followup.send(
+                await self.bot.outbound.followup(
+                    interaction,
                     "Please upload a JSON file.",
                     ephemeral=True
                 )
                 return
 
-            json_content = await file.read()
-            json_str = json_content.decode('utf-8')
-            success = await self.bot.db.save_hangar_data(interaction.user.id, json_str)
+            # Reject oversized files before downloading anything
+            if file.size > MAX_UPLOAD_BYTES:
+                await self.bot.outbound.followup(
+                    interaction,
+                    MSG_UPLOAD_TOO_LARGE.format(limit=MAX_UPLOAD_BYTES // (1024 * 1024)),
+                    ephemeral=True
+                )
+                return
+
+            parser = ShiplistParser()
+
+            async def ship_batches():
+                """Stream the attachment through the parser in batches"""
+                async for chunk in self.stream_attachment(file):
+                    ships = parser.feed(chunk)
+                    if ships:
+                        yield ships
+                parser.close()
+
+            delta = await self.bot.db.save_hangar_data(interaction.user.id, ship_batches())
             
-            if success:
+            if delta is not None:
+                if has_changes(delta):
+                    self.models.mark_stale()
+                    summary = MSG_UPLOAD_DELTA.format(**delta)
+                else:
+                    summary = MSG_UPLOAD_UNCHANGED.format(**delta)
                 embed = discord.Embed(
                     title=f"{ICON_SUCCESS} Hangar Updated",
-                    description=MSG_UPLOAD_SUCCESS,
+                    description=f"{MSG_UPLOAD_SUCCESS}\n{summary}",
                     color=COLOR_SUCCESS
                 )
             else:
+                description = MSG_UPLOAD_ERROR
+                if parser.fatal:
+                    description = f"{description}\n{parser.fatal}"
                 embed = discord.Embed(
                     title=f"{ICON_ERROR} Upload Error",
-                    description=MSG_UPLOAD_ERROR,
+                    description=description,
                     color=COLOR_ERROR
                 )
+
+            # Report ships that were skipped during validation
+            if parser.errors:
+                skipped = "\n".join(parser.errors)
+                if parser.error_count > len(parser.errors):
+                    skipped += f"\n... and {parser.error_count - len(parser.errors)} more"
+                embed.add_field(
+                    name=f"Skipped Ships ({parser.error_count})",
+                    value=f"```{skipped[:1000]}```",
+                    inline=False
+                )
             
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await self.bot.outbound.followup(interaction, embed=embed, ephemeral=True)
 
         except Exception as e:
             logger.error(f"Error in forge-upload: {str(e)}")
@@ -115,71 +205,54 @@ class Hangar(commands.Cog):
                 description=f"An error occurred: {str(e)}",
                 color=COLOR_ERROR
             )
-            await interaction.followup.send(embed=embed, ephemeral=True)
-
-    async def display_hangar(self, target_id: int, target_name: str):
+            await self.bot.outbound.followup(interaction, embed=embed, ephemeral=True)
+
+    async def stream_attachment(self, file: discord.Attachment):
+        """Download an attachment in chunks, enforcing the upload size limit"""
+        received = 0
+        async with self.session.get(file.url) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.content.iter_chunked(UPLOAD_CHUNK_BYTES):
+                received += len(chunk)
+                if received > MAX_UPLOAD_BYTES:
+                    raise ValueError("Upload exceeded the size limit")
+                yield chunk
+
+    async def display_hangar(self, target_id: int, target_name: str) -> Optional[Pages]:
         """Helper function to format hangar display"""
-        ships = await self.bot.db.get_hangar_data(target_id)
-        logger.info(f"Retrieved hangar data for {target_id}: {ships}")
+        version = await self.bot.db.get_data_version(f"hangar_summary:{target_id}")
+        page_key = f"hangar:{target_id}:{target_name}:{version}"
+        pages = self.page_cache.get(page_key)
+        if pages:
+            return pages
+
+        # Pre-grouped at upload time, so there is nothing left to regroup
+        summary = await self.bot.db.get_hangar_summary(target_id)
         
-        if not ships:
+        if not summary:
             return None
 
-        # Group ships by manufacturer
-        manu_groups = defaultdict(list)
-        for ship in ships:
-            manu_groups[ship['manufacturer_name']].append(ship)
+        pages = Pages(f"{target_name}'s Hangar", summary_lines(summary))
+        self.page_cache.set(page_key, pages, pages.size)
+        return pages
 
-        # Build the response message
-        response = [
-            "```md",
-            f"# {target_name}'s Hangar",
-            ""
-        ]
-        
-        # Sort manufacturers
-        for manufacturer in sorted(manu_groups.keys()):
-            response.append(f"## {manufacturer}")
-            
-            # Group and sort ships by base name
-            ship_groups = defaultdict(list)
-            for ship in manu_groups[manufacturer]:
-                ship_groups[ship['name']].append(ship)
-            
-            for base_name, instances in sorted(ship_groups.items()):
-                count = len(instances)
-                
-                # Count LTI and Warbond
-                lti_count = sum(1 for s in instances if s['lti'])
-                wb_count = sum(1 for s in instances if s['warbond'])
-                
-                # Format status
-                status = []
-                if lti_count == count:
-                    status.append("LTI")
-                elif lti_count > 0:
-                    status.append(f"{lti_count}LTI")
-                if wb_count > 0:
-                    status.append(f"{wb_count}WB")
-                status_str = f" [{'+'.join(status)}]" if status else ""
-                
-                # Format custom names
-                custom_names = [s['ship_name'] for s in instances if s['ship_name'] != base_name]
-                custom_str = f' ("{", ".join(custom_names)}")' if custom_names else ""
-                
-                response.append(f"* {count:2d} × {base_name}{status_str}{custom_str}")
-            
-            response.append("")  # Add spacing between manufacturers
-        
-        # Add total count
-        total_ships = len(ships)
-        response.extend([
-            "# Summary",
-            f"* Total Ships: {total_ships}",
-            "```"
-        ])
-        
-        return "\n".join(response)
+    async def display_fleet(self, guild_id: int) -> Optional[Pages]:
+        """Helper function to format the fleet summary display"""
+        version = await self.bot.db.get_data_version(f"fleet_total:{guild_id}")
+        page_key = f"fleet:{guild_id}:{version}"
+        pages = self.page_cache.get(page_key)
+        if pages:
+            return pages
+
+        fleet_data = await self.bot.db.get_fleet_total(guild_id)
+
+        if not fleet_data:
+            return None
+
+        lines = await self.bot.work_pool.run(fleet_lines, fleet_data)
+        pages = Pages("Organization Fleet Summary", lines)
+        self.page_cache.set(page_key, pages, pages.size)
+        return pages
 
     @app_commands.command(name="forge-hangar", description=CMD_HANGAR_DESC)
     @app_commands.describe(member="View another member's hangar (optional)")
@@ -191,27 +264,18 @@ class Hangar(commands.Cog):
             target_id = member.id if member else interaction.user.id
             target_name = member.display_name if member else interaction.user.display_name
 
-            response = await self.display_hangar(target_id, target_name)
+            pages = await self.display_hangar(target_id, target_name)
             
-            if not response:
-                await interaction.followup.send(
+            if not pages:
+                await self.bot.outbound.followup(
+                    interaction,
                     MSG_NO_MEMBER_HANGAR if member else MSG_NO_HANGAR,
                     ephemeral=True
                 )
                 return
 
-            message = await interaction.followup.send(response)
-            
-            async def delete_message():
-                await asyncio.sleep(180)
-                try:
-                    await message.delete()
-                except discord.NotFound:
-                    pass
-                except Exception as e:
-                    logger.error(f"Error deleting message: {e}")
-            
-            asyncio.create_task(delete_message())
+            message = await send_pages(self.bot.outbound, interaction, pages)
+            await self.bot.deletions.schedule(message, MESSAGE_DELETE_AFTER)
 
         except Exception as e:
             logger.error(f"Error in forge-hangar: {str(e)}")
@@ -220,90 +284,34 @@ class Hangar(commands.Cog):
                 description=f"An error occurred: {str(e)}",
                 color=COLOR_ERROR
             )
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await self.bot.outbound.followup(interaction, embed=embed, ephemeral=True)
 
     @app_commands.command(name="forge-fleet", description=CMD_FLEET_DESC)
+    @app_commands.guild_only()
     async def forge_fleet(self, interaction: discord.Interaction):
         """Display total fleet counts across all members"""
         await interaction.response.defer()
 
         try:
-            async with self.bot.db.pool.acquire() as conn:
-                ship_count = await conn.fetchval('SELECT COUNT(*) FROM hangar_ships')
-                logger.info(f"Total ships in database before fleet query: {ship_count}")
-                
-                if ship_count == 0:
-                    await interaction.followup.send(MSG_NO_FLEET_DATA, ephemeral=True)
-                    return
-
-            fleet_data = await self.bot.db.get_fleet_total()
-            logger.info(f"Retrieved fleet data: {fleet_data}")
+            pages = await self.display_fleet(interaction.guild_id)
             
-            if not fleet_data:
+            if not pages:
                 logger.error("No fleet data returned from database")
-                await interaction.followup.send(MSG_NO_FLEET_DATA, ephemeral=True)
+                await self.bot.outbound.followup(interaction, MSG_NO_FLEET_DATA, ephemeral=True)
                 return
 
-            # Group by manufacturer
-            manu_groups = defaultdict(list)
-            for ship_name, data in fleet_data.items():
-                manufacturer = data['manufacturer_name']
-                manu_groups[manufacturer].append((ship_name, data))
-            
-            # Build the response message
-            response = [
-                "```md",
-                "# Organization Fleet Summary",
-                ""
-            ]
-            
-            # Sort manufacturers
-            for manufacturer in sorted(manu_groups.keys()):
-                response.append(f"## {manufacturer}")
-                
-                # Sort ships within manufacturer
-                for ship_name, data in sorted(manu_groups[manufacturer]):
-                    count = data['count']
-                    lti_count = data['lti_count']
-                    wb_count = data['warbond_count']
-                    
-                    # Format status
-                    status = []
-                    if lti_count == count:
-                        status.append("LTI")
-                    elif lti_count > 0:
-                        status.append(f"{lti_count}LTI")
-                    if wb_count > 0:
-                        status.append(f"{wb_count}WB")
-                    status_str = f" [{'+'.join(status)}]" if status else ""
-                    
-                    # Format custom names
-                    custom_str = f' ("{data["custom_names"]}")' if data.get('custom_names') else ""
-                    
-                    response.append(f"* {count:2d} × {ship_name}{status_str}{custom_str}")
-                
-                response.append("")  # Add spacing between manufacturers
-            
-            # Add total count
-            total_ships = sum(data['count'] for data in fleet_data.values())
-            response.extend([
-                "# Summary",
-                f"* Total Fleet Size: {total_ships} ships",
-                "```"
-            ])
-
-            message = await interaction.followup.send("\n".join(response))
-            
-            async def delete_message():
-                await asyncio.sleep(180)
-                try:
-                    await message.delete()
-                except discord.NotFound:
-                    pass
-                except Exception as e:
-                    logger.error(f"Error deleting message: {e}")
-            
-            asyncio.create_task(delete_message())
+            # Identical fleet posts in one channel share a single message
+            message, sent = await share_pages(
+                self.bot.outbound, interaction, pages, ('fleet', interaction.channel_id, pages)
+            )
+            if not sent:
+                # The deferred response is public, so replace it with a private link
+                await self.bot.outbound.delete_original_response(interaction)
+                await self.bot.outbound.followup(
+                    interaction, MSG_FLEET_SHARED.format(url=message.jump_url), ephemeral=True
+                )
+                return
+            await self.bot.deletions.schedule(message, MESSAGE_DELETE_AFTER)
 
         except Exception as e:
             logger.error(f"Error in forge-fleet: {str(e)}")
@@ -312,83 +320,57 @@ class Hangar(commands.Cog):
                 description=f"An error occurred: {str(e)}",
                 color=COLOR_ERROR
             )
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await self.bot.outbound.followup(interaction, embed=embed, ephemeral=True)
 
     @app_commands.command(name="forge-locate", description=CMD_LOCATE_DESC)
-    async def forge_locate(self, interaction: discord.Interaction):
+    @app_commands.describe(ship="Ship model to locate")
+    @app_commands.guild_only()
+    async def forge_locate(self, interaction: discord.Interaction, ship: str):
         """Locate owners of a specific ship model"""
+        await interaction.response.defer(ephemeral=True)
+
         try:
-            ship_models = await self.bot.db.get_all_ship_models()
-            logger.info(f"Retrieved ship models: {ship_models}")
+            owners = await self.bot.db.get_ship_owners(ship, interaction.guild_id)
             
-            if not ship_models:
-                await interaction.response.send_message(MSG_NO_FLEET_DATA, ephemeral=True)
+            if not owners:
+                await self.bot.outbound.followup(
+                    interaction,
+                    f"No owners found for {ship}",
+                    ephemeral=True
+                )
                 return
 
-            select = discord.ui.Select(
-                placeholder="Select a ship model",
-                options=[
-                    discord.SelectOption(label=model[:100])
-                    for model in sorted(ship_models)
-                ]
-            )
+            # Owners are already limited to current members by the query
+            names = self.bot.members.resolve(interaction.guild_id, [owner['user_id'] for owner in owners])
+            members = [(names[owner['user_id']], owner) for owner in owners if owner['user_id'] in names]
 
-            async def select_callback(select_interaction: discord.Interaction):
-                await select_interaction.response.defer()
-                
-                ship_name = select.values[0]
-                owners = await self.bot.db.get_ship_owners(ship_name)
-                
-                if not owners:
-                    await select_interaction.followup.send(
-                        f"No owners found for {ship_name}",
-                        ephemeral=True
-                    )
-                    return
-
-                members = []
-                for owner in owners:
-                    member = select_interaction.guild.get_member(owner['user_id'])
-                    if member:
-                        members.append((member, owner))
-
-                if not members:
-                    await select_interaction.followup.send(
-                        f"All owners of {ship_name} have left the server",
-                        ephemeral=True
-                    )
-                    return
-
-                response = [
-                    "```md",
-                    f"# Owners of {ship_name}",
-                    ""
-                ]
-                
-                for member, data in sorted(members, key=lambda x: x[0].display_name.lower()):
-                    status = []
-                    if data['ship_name'] != ship_name:
-                        status.append(f'"{data["ship_name"]}"')
-                    if data['lti']:
-                        status.append("LTI")
-                    if data['warbond']:
-                        status.append("WB")
-                    status_str = f" [{'+'.join(status)}]" if status else ""
-                    response.append(f"* {member.display_name}{status_str}")
-
-                response.append("```")
-                await select_interaction.followup.send("\n".join(response), ephemeral=True)
-
-            select.callback = select_callback
-            
-            view = discord.ui.View()
-            view.add_item(select)
+            if not members:
+                await self.bot.outbound.followup(
+                    interaction,
+                    f"All owners of {ship} have left the server",
+                    ephemeral=True
+                )
+                return
+
+            response = [
+                "```md",
+                f"# Owners of {ship}",
+                ""
+            ]
             
-            await interaction.response.send_message(
-                "Select a ship model to locate:",
-                view=view,
-                ephemeral=True
-            )
+            for display_name, data in sorted(members, key=lambda x: x[0].lower()):
+                status = []
+                if data['ship_name'] != ship:
+                    status.append(f'"{data["ship_name"]}"')
+                if data['lti']:
+                    status.append("LTI")
+                if data['warbond']:
+                    status.append("WB")
+                status_str = f" [{'+'.join(status)}]" if status else ""
+                response.append(f"* {display_name}{status_str}")
+
+            response.append("```")
+            await self.bot.outbound.followup(interaction, "\n".join(response), ephemeral=True)
 
         except Exception as e:
             logger.error(f"Error in forge-locate: {str(e)}")
@@ -397,18 +379,70 @@ class Hangar(commands.Cog):
                 description=f"An error occurred: {str(e)}",
                 color=COLOR_ERROR
             )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await self.bot.outbound.followup(interaction, embed=embed, ephemeral=True)
+
+    @forge_locate.autocomplete('ship')
+    async def ship_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        """Suggest ship models in this guild's fleet matching what's typed"""
+        if interaction.guild_id is None:
+            return []
+        index = await self.models.get(interaction.guild_id)
+        return [
+            app_commands.Choice(name=model[:100], value=model[:100])
+            for model in index.search(current, limit=AUTOCOMPLETE_LIMIT)
+        ]
+
+    @app_commands.command(name="forge-search", description=CMD_SEARCH_DESC)
+    @app_commands.describe(query="Ship, manufacturer, custom or pledge name (typos are fine)")
+    @app_commands.guild_only()
+    async def forge_search(self, interaction: discord.Interaction, query: app_commands.Range[str, 2, 100]):
+        """Fuzzy search the guild's ships"""
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            results = await self.bot.db.search_ships(query, interaction.guild_id, limit=SEARCH_RESULT_LIMIT)
+
+            names = self.bot.members.resolve(interaction.guild_id, [data['user_id'] for data in results])
+            lines = []
+            for data in results:
+                display_name = names.get(data['user_id'])
+                if not display_name:
+                    continue
+                model = f"{data['manufacturer_name']} {data['name']}"
+                details = [
+                    format_custom_name(data['ship_name'] or data['name'], data['name']),
+                    format_ship_status(data['lti'], data['warbond'])
+                ]
+                details_str = "".join(f" {detail}" for detail in details if detail)
+                lines.append(f"* {display_name}: {model}{details_str}")
+                lines.append(f"  {data['pledge_name']}")
+
+            if not lines:
+                await self.bot.outbound.followup(interaction, MSG_NO_SEARCH_RESULTS.format(query=query), ephemeral=True)
+                return
+
+            await send_pages(self.bot.outbound, interaction, Pages(f"Search: {query}", lines), ephemeral=True)
+
+        except Exception as e:
+            logger.error(f"Error in forge-search: {str(e)}")
+            embed = discord.Embed(
+                title=f"{ICON_ERROR} Error",
+                description=f"An error occurred: {str(e)}",
+                color=COLOR_ERROR
+            )
+            await self.bot.outbound.followup(interaction, embed=embed, ephemeral=True)
 
     @app_commands.command(name="forge-shipcount", description=CMD_SHIPCOUNT_DESC)
+    @app_commands.guild_only()
     async def forge_shipcount(self, interaction: discord.Interaction):
         """Display total ship counts per member"""
         await interaction.response.defer(ephemeral=True)
 
         try:
-            ship_counts = await self.bot.db.get_ship_counts()
+            ship_counts = await self.bot.db.get_ship_counts(interaction.guild_id)
             
             if not ship_counts:
-                await interaction.followup.send(MSG_NO_FLEET_DATA, ephemeral=True)
+                await self.bot.outbound.followup(interaction, MSG_NO_FLEET_DATA, ephemeral=True)
                 return
 
             # Build the response message
@@ -420,12 +454,13 @@ class Hangar(commands.Cog):
             
             # Sort members by ship count (descending)
             total_ships = 0
+            names = self.bot.members.resolve(interaction.guild_id, [data['user_id'] for data in ship_counts])
             for data in sorted(ship_counts, key=lambda x: x['ship_count'], reverse=True):
-                member = interaction.guild.get_member(data['user_id'])
-                if member:
+                display_name = names.get(data['user_id'])
+                if display_name:
                     ship_count = data['ship_count']
                     total_ships += ship_count
-                    response.append(f"* {ship_count:2d} × {member.display_name}")
+                    response.append(f"* {ship_count:2d} × {display_name}")
             
             response.extend([
                 "",
@@ -434,7 +469,7 @@ class Hangar(commands.Cog):
                 "```"
             ])
 
-            await interaction.followup.send("\n".join(response), ephemeral=True)
+            await self.bot.outbound.followup(interaction, "\n".join(response), ephemeral=True)
 
         except Exception as e:
             logger.error(f"Error in forge-shipcount: {str(e)}")
@@ -443,20 +478,20 @@ class Hangar(commands.Cog):
                 description=f"An error occurred: {str(e)}",
                 color=COLOR_ERROR
             )
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await self.bot.outbound.followup(interaction, embed=embed, ephemeral=True)
 
     async def view_hangar_context_menu(self, interaction: discord.Interaction, member: discord.Member):
         """Context menu command for viewing hangar"""
         await interaction.response.defer(ephemeral=True)
         
         try:
-            response = await self.display_hangar(member.id, member.display_name)
+            pages = await self.display_hangar(member.id, member.display_name)
             
-            if not response:
-                await interaction.followup.send(MSG_NO_MEMBER_HANGAR, ephemeral=True)
+            if not pages:
+                await self.bot.outbound.followup(interaction, MSG_NO_MEMBER_HANGAR, ephemeral=True)
                 return
 
-            await interaction.followup.send(response, ephemeral=True)
+            await send_pages(self.bot.outbound, interaction, pages, ephemeral=True)
 
         except Exception as e:
             logger.error(f"Error in view_hangar_context_menu: {str(e)}")
@@ -465,7 +500,7 @@ class Hangar(commands.Cog):
                 description=f"An error occurred: {str(e)}",
                 color=COLOR_ERROR
             )
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await self.bot.outbound.followup(interaction, embed=embed, ephemeral=True)
 
 async def setup(bot):
     await bot.add_cog(Hangar(bot))
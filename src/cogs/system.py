@@ -170,7 +170,7 @@ class ForgeCog(commands.GroupCog, name="forge"):
                 description=MSG_NO_MEMBER_INFO,
                 color=COLOR_ERROR
             )
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await self.bot.outbound.followup(interaction, embed=embed, ephemeral=True)
             return
 
         # Parse the timestamp string if it's from cache
@@ -208,7 +208,7 @@ class ForgeCog(commands.GroupCog, name="forge"):
         if 'audio_config' in info and info['audio_config']:
             embed.add_field(name="Audio Configuration", value=info['audio_config'], inline=False)
 
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await self.bot.outbound.followup(interaction, embed=embed, ephemeral=True)
 
     @app_commands.command(name="collect", description=CMD_COLLECT_DESC)
     async def collect(self, interaction: discord.Interaction):
@@ -1,93 +1,107 @@
 import asyncpg
 import redis.asyncio as redis
 import logging
-from typing import Dict, List, Set, Tuple
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple, Union
 import json
-from collections import defaultdict
+from db.migrate import migrate
+from db.statements import HANGAR_COLUMNS, StatementConnection
+from utils.cache import LocalCache
+from utils.constants import LOCAL_CACHE_MAX_BYTES, LOCAL_CACHE_MAX_ENTRIES, LOCAL_CACHE_TTL
+from utils.executor import WorkPool
+from utils.invalidation import InvalidationBus
+from utils.metrics import Registry, elapsed_ms
+from utils.render import SUMMARY_VERSION, hangar_summary
+from utils.serializers import CacheSerializer
+from utils.singleflight import SingleFlight
 
-logger = logging.getLogger('DraXon_FORGE')
+logger = logging.getLogger('DraXon_FORGE.db')
 
-async def init_db(database_url: str) -> asyncpg.Pool:
-    """Initialize PostgreSQL connection pool"""
+def ship_record(user_id: int, ship: Dict) -> Tuple:
+    """Convert an XPLOR ship entry into a hangar_ships row"""
+    return (
+        user_id,
+        ship['ship_code'],
+        ship.get('ship_name', ship['name']),  # Use custom name if available, else default name
+        ship['manufacturer_code'],
+        ship['manufacturer_name'],
+        ship['lti'],
+        ship['name'],
+        ship['warbond'],
+        ship['entity_type'],
+        ship['pledge_id'],
+        ship['pledge_name'],
+        ship['pledge_date'],
+        ship['pledge_cost']
+    )
+
+def fleet_cache_keys(guild_id: int) -> Tuple[str, ...]:
+    """Cache keys holding fleet-wide data for a guild"""
+    return (f"fleet_total:{guild_id}", f"fleet_ships:{guild_id}", f"ship_counts:{guild_id}")
+
+def hash_size(data: Dict) -> int:
+    """Approximate the encoded size of a Redis hash in bytes"""
+    return sum(len(str(k)) + len(str(v)) for k, v in data.items())
+
+def system_info_record(row: asyncpg.Record) -> Tuple[Dict, Dict]:
+    """Convert a system_info row to its dict and Redis hash forms"""
+    data_dict = dict(row)
+    # Convert datetime to string for Redis
+    data_dict['updated_at'] = data_dict['updated_at'].isoformat()
+    # Convert None values to empty strings for Redis
+    cache_dict = {k: '' if v is None else str(v) for k, v in data_dict.items()}
+    return data_dict, cache_dict
+
+def has_changes(delta: Dict[str, int]) -> bool:
+    """Check whether a hangar upload delta changed any rows"""
+    return bool(delta['inserted'] or delta['updated'] or delta['deleted'])
+
+async def iterate_batches(ships: List[Dict], batch_size: int = 500) -> AsyncIterator[List[Dict]]:
+    """Yield an already parsed ship list in batches for the bulk writer"""
+    for start in range(0, len(ships), batch_size):
+        yield ships[start:start + batch_size]
+
+async def init_db(database_url: str, min_size: int = 2, max_size: int = 10,
+                  max_inactive_connection_lifetime: float = 300,
+                  statement_cache_size: int = 256, statement_timeout_ms: int = 15000) -> asyncpg.Pool:
+    """Initialize PostgreSQL connection pool
+
+    Idle connections beyond min_size are closed after
+    max_inactive_connection_lifetime seconds. Each connection keeps up to
+    statement_cache_size prepared statements, and statements running
+    longer than statement_timeout_ms are cancelled by the server.
+    """
     try:
         # Create connection pool
-        pool = await asyncpg.create_pool(database_url)
-        
-        # Initialize database tables
+        pool = await asyncpg.create_pool(
+            database_url,
+            min_size=min_size,
+            max_size=max_size,
+            max_inactive_connection_lifetime=max_inactive_connection_lifetime,
+            statement_cache_size=statement_cache_size,
+            server_settings={'statement_timeout': str(statement_timeout_ms)}
+        )
+
+        # Bring the schema up to date (a single query when already current)
         async with pool.acquire() as conn:
-            # Create system_info table
-            await conn.execute('''
-                CREATE TABLE IF NOT EXISTS system_info (
-                    user_id BIGINT PRIMARY KEY,
-                    os TEXT NOT NULL,
-                    cpu TEXT NOT NULL,
-                    gpu TEXT NOT NULL,
-                    memory TEXT NOT NULL,
-                    storage TEXT NOT NULL,
-                    keyboard TEXT,
-                    mouse TEXT,
-                    other_controllers TEXT,
-                    audio_config TEXT,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-
-            # Add audio_config column if it doesn't exist
-            await conn.execute('''
-                DO $$
-                BEGIN
-                    IF NOT EXISTS (
-                        SELECT 1 FROM information_schema.columns 
-                        WHERE table_name = 'system_info' 
-                        AND column_name = 'audio_config'
-                    ) THEN
-                        ALTER TABLE system_info ADD COLUMN audio_config TEXT;
-                    END IF;
-                END $$;
-            ''')
-
-            # Create hangar table with detailed ship information if it doesn't exist
-            await conn.execute('''
-                CREATE TABLE IF NOT EXISTS hangar_ships (
-                    user_id BIGINT NOT NULL,
-                    ship_code TEXT NOT NULL,
-                    ship_name TEXT,
-                    manufacturer_code TEXT NOT NULL,
-                    manufacturer_name TEXT NOT NULL,
-                    lti BOOLEAN NOT NULL,
-                    name TEXT NOT NULL,
-                    warbond BOOLEAN NOT NULL,
-                    entity_type TEXT NOT NULL,
-                    pledge_id TEXT NOT NULL,
-                    pledge_name TEXT NOT NULL,
-                    pledge_date TEXT NOT NULL,
-                    pledge_cost TEXT NOT NULL,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    PRIMARY KEY (user_id, ship_code, pledge_id)
-                )
-            ''')
-
-            # Create indexes
-            await conn.execute('''
-                CREATE INDEX IF NOT EXISTS idx_system_info_updated 
-                ON system_info(updated_at)
-            ''')
-            
-            await conn.execute('''
-                CREATE INDEX IF NOT EXISTS idx_hangar_ships_user 
-                ON hangar_ships(user_id)
-            ''')
+            # Backfills may outlast the query timeout; the pool resets it on release
+            await conn.execute('SET statement_timeout = 0')
+            await migrate(conn)
 
         return pool
     except Exception as e:
         logger.error(f"Database initialization error: {e}")
         raise
 
-async def init_redis(redis_url: str) -> redis.Redis:
-    """Initialize Redis connection"""
+async def init_redis(redis_url: str, decode_responses: bool = True) -> redis.Redis:
+    """Initialize Redis connection
+
+    Pass decode_responses=False for the client that holds binary cache values.
+    """
     try:
         # Create Redis connection
-        redis_client = redis.from_url(redis_url, decode_responses=True)
+        redis_client = redis.from_url(redis_url, decode_responses=decode_responses)
         # Test connection
         await redis_client.ping()
         return redis_client
@@ -96,122 +110,489 @@ async def init_redis(redis_url: str) -> redis.Redis:
         raise
 
 class Database:
-    def __init__(self, pool: asyncpg.Pool, cache: redis.Redis):
+    def __init__(self, pool: asyncpg.Pool, cache: redis.Redis, work_pool: Optional[WorkPool] = None,
+                 blobs: Optional[redis.Redis] = None, serializer: Optional[CacheSerializer] = None,
+                 metrics: Optional[Registry] = None):
         self.pool = pool
         self.cache = cache
+        self.work_pool = work_pool
+        
+        # Encoded cache values live on a client that returns raw bytes
+        self.serializer = serializer or CacheSerializer()
+        if self.serializer.binary and blobs is None:
+            raise ValueError("Binary cache encodings need a Redis client without decode_responses")
+        self.blobs = blobs or cache
         
+        # In-process tier in front of Redis
+        self.local = LocalCache(
+            max_entries=LOCAL_CACHE_MAX_ENTRIES,
+            max_bytes=LOCAL_CACHE_MAX_BYTES,
+            default_ttl=LOCAL_CACHE_TTL
+        )
+        # Keeps the local tier consistent with other replicas
+        self.bus = InvalidationBus(cache, self.local)
+        # Coalesces concurrent cache misses for the same key within this
+        # process. Replicas may each load the same key once; that duplicate
+        # work is small and cheaper than a Redis lock on every miss
+        self.flights = SingleFlight()
+        # Pool wait, per-statement and Redis latency in milliseconds
+        self.metrics = metrics or Registry()
+        self.acquire_ms = self.metrics.histogram(
+            'forge_db_acquire_milliseconds', 'Time spent waiting for a pooled connection'
+        )[()]
+        self.query_ms = self.metrics.histogram(
+            'forge_db_query_milliseconds', 'Database statement latency', labels=('statement',)
+        )
+        self.redis_ms = self.metrics.histogram(
+            'forge_redis_command_milliseconds', 'Redis round trip latency', labels=('command',)
+        )
+        # local_hit, redis_hit or miss for each cache key read
+        self.cache_reads = self.metrics.counter(
+            'forge_cache_reads_total', 'Cache key reads by the tier that answered', labels=('result',)
+        )
+        self.register_metrics()
+
+    def register_metrics(self):
+        """Expose pool and local cache state, read when metrics are scraped"""
+        self.metrics.callback(
+            'forge_db_pool_connections', 'Open database connections by state',
+            lambda: {
+                'idle': self.pool.get_idle_size(),
+                'busy': self.pool.get_size() - self.pool.get_idle_size()
+            },
+            labels=('state',)
+        )
+        self.metrics.callback(
+            'forge_db_pool_max_connections', 'Configured database pool size',
+            lambda: self.pool.get_max_size()
+        )
+        self.metrics.callback(
+            'forge_local_cache_entries', 'Entries held in the local cache tier',
+            lambda: self.local.stats()['entries']
+        )
+        self.metrics.callback(
+            'forge_local_cache_bytes', 'Approximate size of the local cache tier',
+            lambda: self.local.stats()['bytes']
+        )
+        self.metrics.callback(
+            'forge_local_cache_evictions_total', 'Entries evicted from the local cache tier',
+            lambda: self.local.stats()['evictions'], kind='counter'
+        )
+        self.metrics.callback(
+            'forge_cache_coalesced_misses_total', 'Cache misses that waited on another caller\'s load',
+            lambda: self.flights.coalesced, kind='counter'
+        )
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[StatementConnection]:
+        """Acquire a pooled connection that runs named statements
+
+        Time spent waiting for the pool is recorded in acquire_ms.
+        """
+        start = time.perf_counter()
+        async with self.pool.acquire() as conn:
+            self.acquire_ms.observe(elapsed_ms(start))
+            yield StatementConnection(conn, self.query_ms)
+
+    def get_pool_stats(self) -> Dict:
+        """Return pool sizing, acquire latency and the slowest statements by p95"""
+        slowest = sorted(
+            ((name, histogram.snapshot()) for name, histogram in self.query_ms.items()),
+            key=lambda item: item[1]['p95'],
+            reverse=True
+        )
+        return {
+            'size': self.pool.get_size(),
+            'idle': self.pool.get_idle_size(),
+            'min_size': self.pool.get_min_size(),
+            'max_size': self.pool.get_max_size(),
+            'acquire': self.acquire_ms.snapshot(),
+            'slowest': slowest[:5]
+        }
+
+    async def get_debug_stats(self) -> Dict:
+        """Get table totals and a sample ship for /forge-debug"""
+        async with self.acquire() as conn:
+            counts = await conn.fetchrow('debug_counts')
+            sample = await conn.fetchrow('debug_sample_ship')
+        stats = dict(counts)
+        stats['sample'] = dict(sample) if sample else None
+        return stats
+
+    def local_get(self, key: str):
+        """Read from the local tier, only trusted while the bus is connected"""
+        if not self.bus.connected:
+            return None
+        return self.local.get(key)
+
+    def local_set(self, key: str, value, size: int):
+        """Write to the local tier while the bus is connected"""
+        if self.bus.connected:
+            self.local.set(key, value, size=size)
+
+    async def cache_get(self, key: str):
+        """Read a value from the local cache tier, falling back to Redis"""
+        value = self.local_get(key)
+        if value is not None:
+            self.cache_reads['local_hit'].inc()
+            return value
+            
+        start = time.perf_counter()
+        raw = await self.blobs.get(key)
+        self.redis_ms['get'].observe(elapsed_ms(start))
+        if raw:
+            # None when written under another cache schema version
+            value = self.serializer.loads(raw)
+            if value is not None:
+                self.local_set(key, value, size=len(raw))
+                self.cache_reads['redis_hit'].inc()
+                return value
+        self.cache_reads['miss'].inc()
+        return None
+
+    async def cache_set(self, key: str, value, ttl: int = 3600):
+        """Write a value with an expiry to Redis and the local cache tier"""
+        raw = self.serializer.dumps(value)
+        start = time.perf_counter()
+        await self.blobs.set(key, raw, ex=ttl)
+        self.redis_ms['set'].observe(elapsed_ms(start))
+        self.local_set(key, value, size=len(raw))
+
+    async def cache_system_info(self, user_id: int, data_dict: Dict, cache_dict: Dict, ttl: int = 3600):
+        """Replace a cached system info hash atomically in one round trip"""
+        cache_key = f"system_info:{user_id}"
+        start = time.perf_counter()
+        async with self.cache.pipeline(transaction=True) as pipe:
+            pipe.delete(cache_key)
+            pipe.hset(cache_key, mapping=cache_dict)
+            pipe.expire(cache_key, ttl)
+            await pipe.execute()
+        self.redis_ms['set_system_info'].observe(elapsed_ms(start))
+        self.local_set(cache_key, data_dict, size=hash_size(cache_dict))
+
+    async def invalidate(self, *keys: str):
+        """Drop keys from both cache tiers on every replica
+
+        Also bumps each key's data version, which renderers use to tell
+        whether output built from the old data is still current.
+        """
+        self.local.delete(*keys)
+        start = time.perf_counter()
+        async with self.cache.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            for key in keys:
+                pipe.incr(f"version:{key}")
+            await pipe.execute()
+        self.redis_ms['invalidate'].observe(elapsed_ms(start))
+        await self.bus.publish(*keys)
+
+    async def get_data_version(self, key: str) -> int:
+        """Get the version counter bumped whenever a cache key is invalidated"""
+        start = time.perf_counter()
+        version = await self.cache.get(f"version:{key}")
+        self.redis_ms['get_version'].observe(elapsed_ms(start))
+        return int(version or 0)
+
     async def get_system_info(self, user_id: int) -> Dict:
         """Get system information from cache or database"""
         # Try cache first
         cache_key = f"system_info:{user_id}"
+        cached_data = self.local_get(cache_key)
+        if cached_data is not None:
+            self.cache_reads['local_hit'].inc()
+            return cached_data
+            
+        start = time.perf_counter()
         cached_data = await self.cache.hgetall(cache_key)
+        self.redis_ms['hgetall'].observe(elapsed_ms(start))
         
         if cached_data:
+            self.local_set(cache_key, cached_data, size=hash_size(cached_data))
+            self.cache_reads['redis_hit'].inc()
             return cached_data
             
-        # If not in cache, get from database
-        async with self.pool.acquire() as conn:
-            data = await conn.fetchrow('''
-                SELECT * FROM system_info WHERE user_id = $1
-            ''', user_id)
-            
-            if data:
-                # Convert to dict and cache
-                data_dict = dict(data)
-                # Convert datetime to string for Redis
-                data_dict['updated_at'] = data_dict['updated_at'].isoformat()
-                # Convert None values to empty strings for Redis
-                cache_dict = {k: '' if v is None else str(v) for k, v in data_dict.items()}
-                await self.cache.hmset(cache_key, cache_dict)
-                await self.cache.expire(cache_key, 3600)  # Cache for 1 hour
-                return data_dict
-                
+        self.cache_reads['miss'].inc()
+        # If not in cache, load once no matter how many callers missed
+        return await self.flights.do(cache_key, lambda: self.load_system_info(user_id))
+
+    async def load_system_info(self, user_id: int) -> Optional[Dict]:
+        """Load system information from the database and cache it"""
+        async with self.acquire() as conn:
+            data = await conn.fetchrow('system_info_by_user', user_id)
+
+        if not data:
             return None
 
+        # Convert to dict and cache for 1 hour
+        data_dict, cache_dict = system_info_record(data)
+        await self.cache_system_info(user_id, data_dict, cache_dict)
+        return data_dict
+
     async def save_system_info(self, user_id: int, os: str, cpu: str, gpu: str, memory: str, storage: str):
         """Save system information to database and cache"""
-        async with self.pool.acquire() as conn:
-            await conn.execute('''
-                INSERT INTO system_info (user_id, os, cpu, gpu, memory, storage)
-                VALUES ($1, $2, $3, $4, $5, $6)
-                ON CONFLICT (user_id) 
-                DO UPDATE SET 
-                    os = $2, cpu = $3, gpu = $4, memory = $5, storage = $6,
-                    updated_at = CURRENT_TIMESTAMP
-            ''', user_id, os, cpu, gpu, memory, storage)
+        async with self.acquire() as conn:
+            await conn.execute('upsert_system_info', user_id, os, cpu, gpu, memory, storage)
             
         # Invalidate cache
-        cache_key = f"system_info:{user_id}"
-        await self.cache.delete(cache_key)
+        await self.invalidate(f"system_info:{user_id}")
 
     async def update_peripherals(self, user_id: int, keyboard: str = None, mouse: str = None, other_controllers: str = None, audio_config: str = None):
         """Update peripherals information in database and cache"""
-        async with self.pool.acquire() as conn:
-            await conn.execute('''
-                UPDATE system_info 
-                SET keyboard = $2, mouse = $3, other_controllers = $4, audio_config = $5,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE user_id = $1
-            ''', user_id, keyboard, mouse, other_controllers, audio_config)
+        async with self.acquire() as conn:
+            await conn.execute('update_peripherals', user_id, keyboard, mouse, other_controllers, audio_config)
             
         # Invalidate cache
-        cache_key = f"system_info:{user_id}"
-        await self.cache.delete(cache_key)
+        await self.invalidate(f"system_info:{user_id}")
+
+    async def save_hangar_data(self, user_id: int, ships: Union[str, AsyncIterable[List[Dict]]]) -> Optional[Dict[str, int]]:
+        """Save hangar data from JSON import with detailed ship information
 
-    async def save_hangar_data(self, user_id: int, ships_json: str):
-        """Save hangar data from JSON import with detailed ship information"""
+        Ships may be given as the raw JSON export or as an async stream of
+        parsed batches. Only the pledges that differ from the stored hangar
+        are written. Returns the delta counts, or None if the import failed.
+        """
         try:
-            ships = json.loads(ships_json)
-            logger.info(f"Saving {len(ships)} ships for user {user_id}")
+            if isinstance(ships, str):
+                ships = iterate_batches(await self.decode_json(ships))
+            
+            async with self.acquire() as conn:
+                async with conn.transaction():
+                    # Serialize concurrent uploads from the same user
+                    guild_ids = await self.lock_member(conn, user_id)
+                    previous = await self.fetch_fleet_contribution(conn, user_id)
+                    
+                    # Stage the upload so the diff can be computed in SQL
+                    await conn.execute('create_hangar_upload')
+                    
+                    pledges = set()
+                    async for batch in ships:
+                        records = [ship_record(user_id, ship) for ship in batch]
+                        pledges.update((record[1], record[9]) for record in records)
+                        await self.bulk_insert_ships(conn, records, table='hangar_upload')
+                    
+                    delta = await self.reconcile_hangar(conn, user_id)
+                    delta['total'] = len(pledges)
+                    
+                    # Keep every guild's fleet aggregates in step with the delta
+                    if has_changes(delta):
+                        current = await self.fetch_fleet_contribution(conn, user_id)
+                        await self.update_fleet_aggregates(conn, guild_ids, previous, current)
+                        await self.store_hangar_summary(conn, user_id)
+
+            # Only invalidate caches if something actually changed
+            if has_changes(delta):
+                keys = [f"hangar:{user_id}", f"hangar_summary:{user_id}"]
+                for guild_id in guild_ids:
+                    keys.extend(fleet_cache_keys(guild_id))
+                await self.invalidate(*keys)
+            
+            logger.info("Saved hangar for user %s: %s", user_id, delta, extra={'user_id': user_id})
+            return delta
+        except Exception as e:
+            logger.error(f"Error saving hangar data: {e}")
+            return None
+
+    async def decode_json(self, data: str):
+        """Decode JSON on the work pool when one is available"""
+        return await self.run_work(json.loads, data)
+
+    async def run_work(self, func, *args):
+        """Run CPU-bound work on the work pool when one is available"""
+        if self.work_pool:
+            return await self.work_pool.run(func, *args)
+        return func(*args)
+
+    async def store_hangar_summary(self, conn: StatementConnection, user_id: int) -> Dict:
+        """Rebuild and persist a user's hangar summary from their stored ships
+
+        Must be called inside a transaction holding the user's lock.
+        """
+        rows = await conn.fetch('hangar_summary_source', user_id)
+        summary = await self.run_work(hangar_summary, [dict(row) for row in rows])
+
+        if not rows:
+            await conn.execute('delete_hangar_summary', user_id)
+            return summary
+
+        await conn.execute('upsert_hangar_summary', user_id, SUMMARY_VERSION, json.dumps(summary))
+        return summary
+
+    async def reconcile_hangar(self, conn: StatementConnection, user_id: int) -> Dict[str, int]:
+        """Apply the staged hangar_upload table as a delta against the stored rows
+
+        Rows are matched on the (user_id, ship_code, pledge_id) primary key.
+        Must be called inside the transaction that staged the upload.
+        """
+        # Duplicate pledges within one export collapse onto a single row
+        deleted = await conn.execute('reconcile_delete', user_id)
+        updated = await conn.execute('reconcile_update', user_id)
+        inserted = await conn.execute('reconcile_insert', user_id)
+
+        return {
+            'inserted': int(inserted.split()[-1]),
+            'updated': int(updated.split()[-1]),
+            'deleted': int(deleted.split()[-1])
+        }
+
+    async def fetch_fleet_contribution(self, conn: StatementConnection, user_id: int) -> Tuple[Dict[Tuple, Tuple], Dict[Tuple, int]]:
+        """Get one user's contribution to the fleet aggregate tables
+
+        Returns per-model (count, lti_count, warbond_count) totals and
+        per-model ship name counts.
+        """
+        rows = await conn.fetch('fleet_contribution', user_id)
+        
+        models = {}
+        names = {}
+        for row in rows:
+            key = (row['manufacturer_name'], row['name'])
+            count, lti_count, warbond_count = models.get(key, (0, 0, 0))
+            models[key] = (
+                count + row['count'],
+                lti_count + row['lti_count'],
+                warbond_count + row['warbond_count']
+            )
+            if row['ship_name'] is not None:
+                name_key = key + (row['ship_name'],)
+                names[name_key] = names.get(name_key, 0) + row['count']
+        return models, names
+
+    async def update_fleet_aggregates(self, conn: StatementConnection, guild_ids: List[int], previous: Tuple, current: Tuple):
+        """Apply the change in one user's contribution to guild fleet aggregates
+
+        Takes the before and after results of fetch_fleet_contribution.
+        Must be called inside the transaction that changed the user's ships
+        or guild membership.
+        """
+        if not guild_ids:
+            return
             
-            async with self.pool.acquire() as conn:
-                # First, delete existing ships for this user
-                await conn.execute('''
-                    DELETE FROM hangar_ships WHERE user_id = $1
-                ''', user_id)
+        previous_models, previous_names = previous
+        current_models, current_names = current
+        
+        # Sorted so concurrent uploads lock aggregate rows in the same order
+        model_changes = []
+        for key in sorted(set(previous_models) | set(current_models)):
+            old = previous_models.get(key, (0, 0, 0))
+            new = current_models.get(key, (0, 0, 0))
+            diff = tuple(n - o for n, o in zip(new, old))
+            if any(diff):
+                model_changes.append(key + diff)
                 
-                # Insert each ship with full details
-                for ship in ships:
-                    await conn.execute('''
-                        INSERT INTO hangar_ships (
-                            user_id, ship_code, ship_name, manufacturer_code,
-                            manufacturer_name, lti, name, warbond, entity_type,
-                            pledge_id, pledge_name, pledge_date, pledge_cost
-                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-                    ''', 
-                    user_id,
-                    ship['ship_code'],
-                    ship.get('ship_name', ship['name']),  # Use custom name if available, else default name
-                    ship['manufacturer_code'],
-                    ship['manufacturer_name'],
-                    ship['lti'],
-                    ship['name'],
-                    ship['warbond'],
-                    ship['entity_type'],
-                    ship['pledge_id'],
-                    ship['pledge_name'],
-                    ship['pledge_date'],
-                    ship['pledge_cost']
+        name_changes = []
+        for key in sorted(set(previous_names) | set(current_names)):
+            diff = current_names.get(key, 0) - previous_names.get(key, 0)
+            if diff:
+                name_changes.append(key + (diff,))
+        
+        guild_ids = sorted(guild_ids)
+        if model_changes:
+            await conn.executemany('add_fleet_aggregates', [
+                (guild_id,) + change for guild_id in guild_ids for change in model_changes
+            ])
+            await conn.execute('prune_fleet_aggregates', guild_ids)
+
+        if name_changes:
+            await conn.executemany('add_fleet_ship_names', [
+                (guild_id,) + change for guild_id in guild_ids for change in name_changes
+            ])
+            await conn.execute('prune_fleet_ship_names', guild_ids)
+
+    async def lock_member(self, conn: StatementConnection, user_id: int) -> List[int]:
+        """Lock a user's hangar and guild fleets for the current transaction
+
+        Returns the guilds the user belongs to. Each guild is locked in
+        shared mode so only a full guild rebuild has to wait.
+        """
+        await conn.execute('lock_xact', user_id)
+        rows = await conn.fetch('member_guilds', user_id)
+        guild_ids = [row['guild_id'] for row in rows]
+        for guild_id in guild_ids:
+            await conn.execute('lock_xact_shared', guild_id)
+        return guild_ids
+
+    async def sync_guild_members(self, guild_id: int, member_ids: Iterable[int]):
+        """Replace a guild's member list and rebuild its fleet aggregates"""
+        try:
+            async with self.acquire() as conn:
+                async with conn.transaction():
+                    # Exclusive guild lock waits out in-flight uploads
+                    await conn.execute('lock_xact', guild_id)
+                    await conn.execute('delete_guild_members', guild_id)
+                    await conn.copy_records(
+                        'guild_members',
+                        records=[(guild_id, user_id) for user_id in set(member_ids)],
+                        columns=('guild_id', 'user_id')
                     )
-                
-            # Invalidate caches
-            cache_key = f"hangar:{user_id}"
-            await self.cache.delete(cache_key)
-            await self.cache.delete("fleet_total")
-            await self.cache.delete("fleet_ships")
-            await self.cache.delete("ship_counts")  # New cache key for ship counts
+
+                    await conn.execute('delete_guild_aggregates', guild_id)
+                    await conn.execute('delete_guild_ship_names', guild_id)
+                    await conn.execute('rebuild_guild_aggregates', guild_id)
+                    await conn.execute('rebuild_guild_ship_names', guild_id)
+
+            await self.invalidate(*fleet_cache_keys(guild_id))
+        except Exception as e:
+            logger.error(f"Error syncing members for guild {guild_id}: {e}")
+
+    async def update_guild_member(self, guild_id: int, user_id: int, joined: bool):
+        """Record a member joining or leaving a guild and adjust its fleet"""
+        try:
+            async with self.acquire() as conn:
+                async with conn.transaction():
+                    await self.lock_member(conn, user_id)
+                    await conn.execute('lock_xact_shared', guild_id)
+
+                    if joined:
+                        status = await conn.execute('add_guild_member', guild_id, user_id)
+                    else:
+                        status = await conn.execute('remove_guild_member', guild_id, user_id)
+                    if status.endswith(' 0'):
+                        return
+                        
+                    contribution = await self.fetch_fleet_contribution(conn, user_id)
+                    if not contribution[0]:
+                        return
+                    empty = ({}, {})
+                    if joined:
+                        await self.update_fleet_aggregates(conn, [guild_id], empty, contribution)
+                    else:
+                        await self.update_fleet_aggregates(conn, [guild_id], contribution, empty)
+                        
+            await self.invalidate(*fleet_cache_keys(guild_id))
+        except Exception as e:
+            logger.error(f"Error updating member {user_id} in guild {guild_id}: {e}")
+
+    async def remove_guild(self, guild_id: int):
+        """Drop all fleet data for a guild the bot has left"""
+        try:
+            async with self.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute('lock_xact', guild_id)
+                    await conn.execute('delete_guild_members', guild_id)
+                    await conn.execute('delete_guild_aggregates', guild_id)
+                    await conn.execute('delete_guild_ship_names', guild_id)
+            await self.invalidate(*fleet_cache_keys(guild_id))
+        except Exception as e:
+            logger.error(f"Error removing guild {guild_id}: {e}")
+
+    async def bulk_insert_ships(self, conn: StatementConnection, records: List[Tuple], table: str = 'hangar_ships') -> int:
+        """Bulk load hangar rows with COPY, falling back to executemany
+
+        Must be called inside a transaction. Returns the number of rows written.
+        """
+        if not records:
+            return 0
             
-            # Verify the data was saved
-            async with self.pool.acquire() as conn:
-                count = await conn.fetchval('''
-                    SELECT COUNT(*) FROM hangar_ships WHERE user_id = $1
-                ''', user_id)
-                logger.info(f"Saved {count} ships for user {user_id}")
+        try:
+            # Savepoint so a failed COPY doesn't abort the caller's transaction
+            async with conn.transaction():
+                status = await conn.copy_records(table, records=records, columns=HANGAR_COLUMNS)
+            return int(status.split()[-1])
+        except asyncpg.PostgresError as e:
+            logger.warning(f"COPY into {table} failed, falling back to executemany: {e}")
             
-            return True
-        except Exception as e:
-            logger.error(f"Error saving hangar data: {e}")
-            return False
+        await conn.executemany(f'insert_{table}', records)
+        return len(records)
 
     async def get_hangar_data(self, user_id: int) -> List[Dict]:
         """Get hangar data from cache or database"""
@@ -219,193 +600,200 @@ class Database:
         
         try:
             # Try cache first
-            cached_data = await self.cache.get(cache_key)
-            if cached_data:
-                return json.loads(cached_data)
+            cached_data = await self.cache_get(cache_key)
+            if cached_data is not None:
+                return cached_data
                 
-            # If not in cache, get from database
-            async with self.pool.acquire() as conn:
-                rows = await conn.fetch('''
-                    SELECT 
-                        ship_code, ship_name, manufacturer_code, manufacturer_name,
-                        lti, name, warbond, entity_type, pledge_id, pledge_name,
-                        pledge_date, pledge_cost
-                    FROM hangar_ships 
-                    WHERE user_id = $1
-                    ORDER BY manufacturer_name, name
-                ''', user_id)
-                
-                if rows:
-                    # Convert to list of dictionaries
-                    ships = [dict(row) for row in rows]
-                    # Cache the result
-                    await self.cache.set(cache_key, json.dumps(ships))
-                    await self.cache.expire(cache_key, 3600)  # Cache for 1 hour
-                    return ships
-                    
-                return []
+            # If not in cache, load once no matter how many callers missed
+            return await self.flights.do(cache_key, lambda: self.load_hangar_data(user_id))
         except Exception as e:
             logger.error(f"Error retrieving hangar data: {e}")
             return []
 
-    async def get_fleet_total(self) -> Dict[str, Dict]:
-        """Get total fleet counts with detailed information"""
-        cache_key = "fleet_total"
+    async def load_hangar_data(self, user_id: int) -> List[Dict]:
+        """Load hangar data from the database and cache it"""
+        async with self.acquire() as conn:
+            rows = await conn.fetch('hangar_by_user', user_id)
+            
+        if not rows:
+            return []
+            
+        # Convert to list of dictionaries
+        ships = [dict(row) for row in rows]
+        # Cache the result
+        await self.cache_set(f"hangar:{user_id}", ships)  # Cache for 1 hour
+        return ships
+
+    async def get_hangar_summary(self, user_id: int) -> Optional[Dict]:
+        """Get a user's pre-grouped hangar summary, or None if they have no ships"""
+        cache_key = f"hangar_summary:{user_id}"
+
+        try:
+            # Try cache first
+            summary = await self.cache_get(cache_key)
+            if summary is None:
+                # If not in cache, load once no matter how many callers missed
+                summary = await self.flights.do(cache_key, lambda: self.load_hangar_summary(user_id))
+            return summary if summary['total'] else None
+        except Exception as e:
+            logger.error(f"Error retrieving hangar summary: {e}")
+            return None
+
+    async def load_hangar_summary(self, user_id: int) -> Dict:
+        """Load a stored hangar summary, rebuilding it if missing or outdated"""
+        async with self.acquire() as conn:
+            row = await conn.fetchrow('hangar_summary_by_user', user_id)
+
+            if row and row['version'] == SUMMARY_VERSION:
+                summary = json.loads(row['summary'])
+            else:
+                # Uploaded before summaries existed, or in an older layout
+                async with conn.transaction():
+                    await conn.execute('lock_xact', user_id)
+                    summary = await self.store_hangar_summary(conn, user_id)
+
+        # Cache the result
+        await self.cache_set(f"hangar_summary:{user_id}", summary)
+        return summary
+
+    async def get_fleet_total(self, guild_id: int) -> Dict[str, Dict]:
+        """Get a guild's total fleet counts with detailed information"""
+        cache_key = f"fleet_total:{guild_id}"
         
         try:
             # Try cache first
-            cached_data = await self.cache.get(cache_key)
-            if cached_data:
-                return json.loads(cached_data)
-
-            # If not in cache, calculate from database
-            async with self.pool.acquire() as conn:
-                # First check if we have any ships at all
-                count = await conn.fetchval('SELECT COUNT(*) FROM hangar_ships')
-                logger.info(f"Total ships in database: {count}")
-                
-                if count == 0:
-                    logger.info("No ships found in database")
-                    return {}
-
-                # Get fleet statistics
-                rows = await conn.fetch('''
-                    SELECT 
-                        manufacturer_name, name,
-                        COUNT(*) as count,
-                        COUNT(*) FILTER (WHERE lti = true) as lti_count,
-                        COUNT(*) FILTER (WHERE warbond = true) as warbond_count,
-                        STRING_AGG(DISTINCT ship_name, ', ' ORDER BY ship_name) as custom_names
-                    FROM hangar_ships
-                    GROUP BY manufacturer_name, name
-                    ORDER BY manufacturer_name, name
-                ''')
-                
-                logger.info(f"Fleet query returned {len(rows)} rows")
-                
-                fleet_data = {}
-                for row in rows:
-                    # Use just the name as the key, and include manufacturer in the data
-                    fleet_data[row['name']] = {
-                        'manufacturer_name': row['manufacturer_name'],
-                        'count': row['count'],
-                        'lti_count': row['lti_count'],
-                        'warbond_count': row['warbond_count'],
-                        'custom_names': row['custom_names'] if row['custom_names'] != row['name'] else None
-                    }
-                    logger.info(f"Added fleet data for {row['name']}: {fleet_data[row['name']]}")
-
-                if not fleet_data:
-                    logger.error("No fleet data generated from query results")
-                    return {}
-
-                # Cache the result
-                await self.cache.set(cache_key, json.dumps(fleet_data))
-                await self.cache.expire(cache_key, 3600)  # Cache for 1 hour
-                
-                return fleet_data
+            cached_data = await self.cache_get(cache_key)
+            if cached_data is not None:
+                return cached_data
+
+            # If not in cache, load once no matter how many callers missed
+            return await self.flights.do(cache_key, lambda: self.load_fleet_total(guild_id))
         except Exception as e:
             logger.error(f"Error getting fleet total: {e}")
             return {}
 
-    async def get_ship_counts(self) -> List[Dict]:
-        """Get ship counts per user"""
-        cache_key = "ship_counts"
+    async def load_fleet_total(self, guild_id: int) -> Dict[str, Dict]:
+        """Load a guild's fleet totals from the maintained aggregates and cache them"""
+        async with self.acquire() as conn:
+            rows = await conn.fetch('fleet_total', guild_id)
+            
+        logger.debug("Fleet query returned %d rows", len(rows), extra={'guild_id': guild_id, 'sample_every': 100})
+        
+        if not rows:
+            logger.debug("No ships found in database")
+            return {}
+        
+        fleet_data = {}
+        for row in rows:
+            # Use just the name as the key, and include manufacturer in the data
+            fleet_data[row['name']] = {
+                'manufacturer_name': row['manufacturer_name'],
+                'count': row['count'],
+                'lti_count': row['lti_count'],
+                'warbond_count': row['warbond_count'],
+                'custom_names': row['custom_names'] if row['custom_names'] != row['name'] else None
+            }
+
+        # Cache the result
+        await self.cache_set(f"fleet_total:{guild_id}", fleet_data)  # Cache for 1 hour
+        
+        return fleet_data
+
+    async def get_ship_counts(self, guild_id: int) -> List[Dict]:
+        """Get ship counts per member of a guild"""
+        cache_key = f"ship_counts:{guild_id}"
         
         try:
             # Try cache first
-            cached_data = await self.cache.get(cache_key)
-            if cached_data:
-                return json.loads(cached_data)
-
-            # If not in cache, calculate from database
-            async with self.pool.acquire() as conn:
-                rows = await conn.fetch('''
-                    SELECT 
-                        user_id,
-                        COUNT(*) as ship_count
-                    FROM hangar_ships
-                    GROUP BY user_id
-                    ORDER BY COUNT(*) DESC
-                ''')
-                
-                if not rows:
-                    return []
+            cached_data = await self.cache_get(cache_key)
+            if cached_data is not None:
+                return cached_data
 
-                counts = [dict(row) for row in rows]
-                
-                # Cache the result
-                await self.cache.set(cache_key, json.dumps(counts))
-                await self.cache.expire(cache_key, 3600)  # Cache for 1 hour
-                
-                return counts
+            # If not in cache, load once no matter how many callers missed
+            return await self.flights.do(cache_key, lambda: self.load_ship_counts(guild_id))
         except Exception as e:
             logger.error(f"Error getting ship counts: {e}")
             return []
 
-    async def get_ship_owners(self, ship_name: str) -> List[Dict]:
-        """Get detailed information about owners of a specific ship"""
+    async def load_ship_counts(self, guild_id: int) -> List[Dict]:
+        """Load per-member ship counts for a guild and cache them"""
+        async with self.acquire() as conn:
+            rows = await conn.fetch('ship_counts', guild_id)
+            
+        if not rows:
+            return []
+
+        counts = [dict(row) for row in rows]
+        
+        # Cache the result
+        await self.cache_set(f"ship_counts:{guild_id}", counts)  # Cache for 1 hour
+        
+        return counts
+
+    async def get_ship_owners(self, ship_name: str, guild_id: int) -> List[Dict]:
+        """Get detailed information about a guild's owners of a specific ship"""
         try:
-            async with self.pool.acquire() as conn:
-                rows = await conn.fetch('''
-                    SELECT 
-                        user_id, ship_name, lti, warbond,
-                        pledge_date, pledge_cost, pledge_name
-                    FROM hangar_ships
-                    WHERE manufacturer_name || ' ' || name = $1
-                    ORDER BY pledge_date
-                ''', ship_name)
+            async with self.acquire() as conn:
+                rows = await conn.fetch('ship_owners', ship_name, guild_id)
                 
                 return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting ship owners: {e}")
             return []
 
-    async def get_all_ship_models(self) -> Set[str]:
-        """Get a set of all unique ship models in the fleet"""
-        cache_key = "fleet_ships"
-        
+    async def search_ships(self, query: str, guild_id: int, limit: int = 50) -> List[Dict]:
+        """Search a guild's ships by model, manufacturer, custom or pledge name
+
+        Results are ranked by trigram word similarity, best match first.
+        """
         try:
-            # Try cache first
-            cached_data = await self.cache.get(cache_key)
-            if cached_data:
-                return set(json.loads(cached_data))
-
-            # If not in cache, get from database
-            async with self.pool.acquire() as conn:
-                # First check if we have any ships at all
-                count = await conn.fetchval('SELECT COUNT(*) FROM hangar_ships')
-                logger.info(f"Total ships in database: {count}")
+            async with self.acquire() as conn:
+                rows = await conn.fetch('ship_search', query, guild_id, limit)
                 
-                if count == 0:
-                    logger.info("No ships found in database")
-                    return set()
-
-                rows = await conn.fetch('''
-                    SELECT DISTINCT manufacturer_name || ' ' || name as full_name
-                    FROM hangar_ships
-                    ORDER BY full_name
-                ''')
-                
-                logger.info(f"Found {len(rows)} unique ship models")
-                ship_models = {row['full_name'] for row in rows}
+                return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Error searching ships: {e}")
+            return []
 
-                if not ship_models:
-                    logger.error("No ship models found in query results")
-                    return set()
+    async def get_all_ship_models(self, guild_id: int) -> Set[str]:
+        """Get a set of all unique ship models in a guild's fleet
 
-                # Cache the result
-                await self.cache.set(cache_key, json.dumps(list(ship_models)))
-                await self.cache.expire(cache_key, 3600)  # Cache for 1 hour
-                
-                return ship_models
-        except Exception as e:
-            logger.error(f"Error getting ship models: {e}")
-            return set()
+        Errors are raised rather than returned as an empty set, so the
+        model index keeps its current names through a failed refresh.
+        """
+        cache_key = f"fleet_ships:{guild_id}"
+        
+        # Try cache first
+        cached_data = await self.cache_get(cache_key)
+        if cached_data is not None:
+            return set(cached_data)
+
+        # If not in cache, load once no matter how many callers missed
+        return set(await self.flights.do(cache_key, lambda: self.load_all_ship_models(guild_id)))
+
+    async def load_all_ship_models(self, guild_id: int) -> List[str]:
+        """Load the sorted list of a guild's ship models and cache it"""
+        async with self.acquire() as conn:
+            rows = await conn.fetch('ship_models', guild_id)
+            
+        logger.debug("Found %d unique ship models", len(rows), extra={'guild_id': guild_id, 'sample_every': 100})
+        if not rows:
+            logger.debug("No ships found in database")
+            return []
+            
+        ship_models = [row['full_name'] for row in rows]
+
+        # Cache the result
+        await self.cache_set(f"fleet_ships:{guild_id}", ship_models)  # Cache for 1 hour
+        
+        return ship_models
 
     async def close(self):
         """Close database and cache connections"""
+        await self.bus.stop()
         if self.pool:
             await self.pool.close()
+        if self.blobs is not self.cache:
+            await self.blobs.aclose()
         if self.cache:
             await self.cache.aclose()
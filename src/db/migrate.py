@@ -0,0 +1,76 @@
+import asyncpg
+import logging
+import re
+from pathlib import Path
+from typing import List, Tuple
+
+logger = logging.getLogger('DraXon_FORGE.db')
+
+MIGRATIONS_DIR = Path(__file__).parent / 'migrations'
+
+# Advisory lock key held while migrations run, so replicas starting
+# together apply each migration exactly once
+MIGRATION_LOCK_ID = 0x464F524745  # "FORGE"
+
+MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+def load_migrations() -> List[Tuple[int, str, str]]:
+    """Load (version, name, sql) for every migration file, in order"""
+    migrations = []
+    for path in MIGRATIONS_DIR.iterdir():
+        match = MIGRATION_FILE.match(path.name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), path.read_text()))
+    migrations.sort()
+
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError("Duplicate migration version numbers")
+    return migrations
+
+async def get_schema_version(conn: asyncpg.Connection) -> int:
+    """Return the applied schema version, or 0 for a fresh database"""
+    try:
+        return await conn.fetchval('SELECT MAX(version) FROM schema_version') or 0
+    except asyncpg.UndefinedTableError:
+        return 0
+
+async def migrate(conn: asyncpg.Connection) -> int:
+    """Apply pending migrations and return the resulting schema version
+
+    When the schema is already current this costs a single query.
+    """
+    migrations = load_migrations()
+    latest = migrations[-1][0] if migrations else 0
+
+    version = await get_schema_version(conn)
+    if version >= latest:
+        return version
+
+    await conn.execute('SELECT pg_advisory_lock($1)', MIGRATION_LOCK_ID)
+    try:
+        await conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Another replica may have migrated while we waited for the lock
+        version = await get_schema_version(conn)
+        for number, name, sql in migrations:
+            if number <= version:
+                continue
+            logger.info(f"Applying migration {number:04d}_{name}")
+            async with conn.transaction():
+                await conn.execute(sql)
+                await conn.execute('''
+                    INSERT INTO schema_version (version, name) VALUES ($1, $2)
+                ''', number, name)
+            version = number
+    finally:
+        await conn.execute('SELECT pg_advisory_unlock($1)', MIGRATION_LOCK_ID)
+
+    logger.info(f"Database schema at version {version}")
+    return version
@@ -0,0 +1,46 @@
+-- Core tables for system specifications and hangar ships.
+-- Idempotent so installs created before versioned migrations adopt it cleanly.
+
+CREATE TABLE IF NOT EXISTS system_info (
+    user_id BIGINT PRIMARY KEY,
+    os TEXT NOT NULL,
+    cpu TEXT NOT NULL,
+    gpu TEXT NOT NULL,
+    memory TEXT NOT NULL,
+    storage TEXT NOT NULL,
+    keyboard TEXT,
+    mouse TEXT,
+    other_controllers TEXT,
+    audio_config TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Columns added after the original release
+ALTER TABLE system_info ADD COLUMN IF NOT EXISTS keyboard TEXT;
+ALTER TABLE system_info ADD COLUMN IF NOT EXISTS mouse TEXT;
+ALTER TABLE system_info ADD COLUMN IF NOT EXISTS other_controllers TEXT;
+ALTER TABLE system_info ADD COLUMN IF NOT EXISTS audio_config TEXT;
+
+CREATE TABLE IF NOT EXISTS hangar_ships (
+    user_id BIGINT NOT NULL,
+    ship_code TEXT NOT NULL,
+    ship_name TEXT,
+    manufacturer_code TEXT NOT NULL,
+    manufacturer_name TEXT NOT NULL,
+    lti BOOLEAN NOT NULL,
+    name TEXT NOT NULL,
+    warbond BOOLEAN NOT NULL,
+    entity_type TEXT NOT NULL,
+    pledge_id TEXT NOT NULL,
+    pledge_name TEXT NOT NULL,
+    pledge_date TEXT NOT NULL,
+    pledge_cost TEXT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, ship_code, pledge_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_system_info_updated
+ON system_info(updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_hangar_ships_user
+ON hangar_ships(user_id);
@@ -0,0 +1,36 @@
+-- Fleet aggregates, maintained incrementally on upload.
+
+CREATE TABLE IF NOT EXISTS fleet_aggregates (
+    manufacturer_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    lti_count INTEGER NOT NULL DEFAULT 0,
+    warbond_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (manufacturer_name, name)
+);
+
+CREATE TABLE IF NOT EXISTS fleet_ship_names (
+    manufacturer_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ship_name TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (manufacturer_name, name, ship_name)
+);
+
+-- Backfill from hangars uploaded before the aggregates existed
+INSERT INTO fleet_aggregates (manufacturer_name, name, count, lti_count, warbond_count)
+SELECT
+    manufacturer_name, name,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE lti = true),
+    COUNT(*) FILTER (WHERE warbond = true)
+FROM hangar_ships
+WHERE NOT EXISTS (SELECT 1 FROM fleet_aggregates)
+GROUP BY manufacturer_name, name;
+
+INSERT INTO fleet_ship_names (manufacturer_name, name, ship_name, count)
+SELECT manufacturer_name, name, ship_name, COUNT(*)
+FROM hangar_ships
+WHERE ship_name IS NOT NULL
+AND NOT EXISTS (SELECT 1 FROM fleet_ship_names)
+GROUP BY manufacturer_name, name, ship_name;
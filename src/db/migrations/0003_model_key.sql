@@ -0,0 +1,8 @@
+-- Indexed model key for /forge-locate owner lookups.
+-- Existing rows are filled in when the generated column is added.
+
+ALTER TABLE hangar_ships ADD COLUMN IF NOT EXISTS model_key TEXT
+GENERATED ALWAYS AS (manufacturer_name || ' ' || name) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_hangar_ships_model
+ON hangar_ships(model_key);
@@ -0,0 +1,35 @@
+-- Guild-scoped fleet data.
+-- Hangars stay per user; guild_members decides which guilds' fleets they
+-- count towards. Aggregates become per guild and are rebuilt from
+-- hangar_ships when the bot syncs each guild's member list.
+
+CREATE TABLE IF NOT EXISTS guild_members (
+    guild_id BIGINT NOT NULL,
+    user_id BIGINT NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_guild_members_user
+ON guild_members(user_id);
+
+DROP TABLE IF EXISTS fleet_aggregates;
+DROP TABLE IF EXISTS fleet_ship_names;
+
+CREATE TABLE fleet_aggregates (
+    guild_id BIGINT NOT NULL,
+    manufacturer_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    lti_count INTEGER NOT NULL DEFAULT 0,
+    warbond_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, manufacturer_name, name)
+);
+
+CREATE TABLE fleet_ship_names (
+    guild_id BIGINT NOT NULL,
+    manufacturer_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ship_name TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, manufacturer_name, name, ship_name)
+);
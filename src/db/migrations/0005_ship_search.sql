@@ -0,0 +1,12 @@
+-- Fuzzy /forge-search over model, manufacturer, custom and pledge names.
+-- Trigram GIN index keeps word_similarity lookups off sequential scans.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE hangar_ships ADD COLUMN IF NOT EXISTS search_text TEXT
+GENERATED ALWAYS AS (
+    manufacturer_name || ' ' || name || ' ' || COALESCE(ship_name, '') || ' ' || pledge_name
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_hangar_ships_search
+ON hangar_ships USING GIN (search_text gin_trgm_ops);
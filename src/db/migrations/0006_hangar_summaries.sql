@@ -0,0 +1,9 @@
+-- Pre-grouped hangar summaries, rebuilt when an upload changes a hangar.
+-- Rows are filled in lazily on first view for hangars uploaded before this.
+
+CREATE TABLE IF NOT EXISTS hangar_summaries (
+    user_id BIGINT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    summary JSONB NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,314 @@
+import asyncpg
+import time
+from typing import Dict, List, Optional
+
+from utils.metrics import Family, elapsed_ms
+
+# Column order used for bulk loads into hangar_ships
+HANGAR_COLUMNS = (
+    'user_id', 'ship_code', 'ship_name', 'manufacturer_code',
+    'manufacturer_name', 'lti', 'name', 'warbond', 'entity_type',
+    'pledge_id', 'pledge_name', 'pledge_date', 'pledge_cost'
+)
+
+_COLUMNS = ', '.join(HANGAR_COLUMNS)
+_PLACEHOLDERS = ', '.join(f'${i}' for i in range(1, len(HANGAR_COLUMNS) + 1))
+
+# Duplicate pledges within one export collapse onto a single row
+_UPLOAD = '''
+    (SELECT DISTINCT ON (ship_code, pledge_id) * FROM hangar_upload
+     ORDER BY ship_code, pledge_id) u
+'''
+
+# Every statement Database runs, by name. asyncpg prepares each one on
+# first use per connection and keeps it in the statement cache.
+STATEMENTS: Dict[str, str] = {
+    # Advisory locks serializing uploads, membership changes and rebuilds
+    'lock_xact': 'SELECT pg_advisory_xact_lock($1)',
+    'lock_xact_shared': 'SELECT pg_advisory_xact_lock_shared($1)',
+
+    # System information
+    'system_info_by_user': '''
+        SELECT * FROM system_info WHERE user_id = $1
+    ''',
+    'upsert_system_info': '''
+        INSERT INTO system_info (user_id, os, cpu, gpu, memory, storage)
+        VALUES ($1, $2, $3, $4, $5, $6)
+        ON CONFLICT (user_id)
+        DO UPDATE SET
+            os = $2, cpu = $3, gpu = $4, memory = $5, storage = $6,
+            updated_at = CURRENT_TIMESTAMP
+    ''',
+    'update_peripherals': '''
+        UPDATE system_info
+        SET keyboard = $2, mouse = $3, other_controllers = $4, audio_config = $5,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE user_id = $1
+    ''',
+
+    # Hangar uploads, staged in a temporary table and applied as a delta
+    'create_hangar_upload': '''
+        CREATE TEMPORARY TABLE hangar_upload
+        (LIKE hangar_ships INCLUDING DEFAULTS)
+        ON COMMIT DROP
+    ''',
+    'insert_hangar_ships': f'''
+        INSERT INTO hangar_ships ({_COLUMNS})
+        VALUES ({_PLACEHOLDERS})
+    ''',
+    'insert_hangar_upload': f'''
+        INSERT INTO hangar_upload ({_COLUMNS})
+        VALUES ({_PLACEHOLDERS})
+    ''',
+    'reconcile_delete': '''
+        DELETE FROM hangar_ships h
+        WHERE h.user_id = $1
+        AND NOT EXISTS (
+            SELECT 1 FROM hangar_upload u
+            WHERE u.ship_code = h.ship_code AND u.pledge_id = h.pledge_id
+        )
+    ''',
+    'reconcile_update': f'''
+        UPDATE hangar_ships h SET
+            ship_name = u.ship_name,
+            manufacturer_code = u.manufacturer_code,
+            manufacturer_name = u.manufacturer_name,
+            lti = u.lti,
+            name = u.name,
+            warbond = u.warbond,
+            entity_type = u.entity_type,
+            pledge_name = u.pledge_name,
+            pledge_date = u.pledge_date,
+            pledge_cost = u.pledge_cost,
+            updated_at = CURRENT_TIMESTAMP
+        FROM {_UPLOAD}
+        WHERE h.user_id = $1
+        AND h.ship_code = u.ship_code AND h.pledge_id = u.pledge_id
+        AND (h.ship_name, h.manufacturer_code, h.manufacturer_name, h.lti, h.name,
+             h.warbond, h.entity_type, h.pledge_name, h.pledge_date, h.pledge_cost)
+            IS DISTINCT FROM
+            (u.ship_name, u.manufacturer_code, u.manufacturer_name, u.lti, u.name,
+             u.warbond, u.entity_type, u.pledge_name, u.pledge_date, u.pledge_cost)
+    ''',
+    'reconcile_insert': f'''
+        INSERT INTO hangar_ships ({_COLUMNS})
+        SELECT {_COLUMNS} FROM {_UPLOAD}
+        WHERE NOT EXISTS (
+            SELECT 1 FROM hangar_ships h
+            WHERE h.user_id = $1
+            AND h.ship_code = u.ship_code AND h.pledge_id = u.pledge_id
+        )
+    ''',
+
+    # Hangar summaries
+    'hangar_summary_source': '''
+        SELECT manufacturer_name, name, ship_name, lti, warbond
+        FROM hangar_ships
+        WHERE user_id = $1
+    ''',
+    'hangar_summary_by_user': '''
+        SELECT version, summary FROM hangar_summaries WHERE user_id = $1
+    ''',
+    'upsert_hangar_summary': '''
+        INSERT INTO hangar_summaries (user_id, version, summary)
+        VALUES ($1, $2, $3::jsonb)
+        ON CONFLICT (user_id) DO UPDATE SET
+            version = EXCLUDED.version,
+            summary = EXCLUDED.summary,
+            updated_at = CURRENT_TIMESTAMP
+    ''',
+    'delete_hangar_summary': '''
+        DELETE FROM hangar_summaries WHERE user_id = $1
+    ''',
+
+    # Fleet aggregate maintenance
+    'fleet_contribution': '''
+        SELECT
+            manufacturer_name, name, ship_name,
+            COUNT(*) as count,
+            COUNT(*) FILTER (WHERE lti = true) as lti_count,
+            COUNT(*) FILTER (WHERE warbond = true) as warbond_count
+        FROM hangar_ships
+        WHERE user_id = $1
+        GROUP BY manufacturer_name, name, ship_name
+    ''',
+    'add_fleet_aggregates': '''
+        INSERT INTO fleet_aggregates AS f (
+            guild_id, manufacturer_name, name, count, lti_count, warbond_count
+        ) VALUES ($1, $2, $3, $4, $5, $6)
+        ON CONFLICT (guild_id, manufacturer_name, name) DO UPDATE SET
+            count = f.count + EXCLUDED.count,
+            lti_count = f.lti_count + EXCLUDED.lti_count,
+            warbond_count = f.warbond_count + EXCLUDED.warbond_count
+    ''',
+    'prune_fleet_aggregates': '''
+        DELETE FROM fleet_aggregates WHERE guild_id = ANY($1::bigint[]) AND count <= 0
+    ''',
+    'add_fleet_ship_names': '''
+        INSERT INTO fleet_ship_names AS n (
+            guild_id, manufacturer_name, name, ship_name, count
+        ) VALUES ($1, $2, $3, $4, $5)
+        ON CONFLICT (guild_id, manufacturer_name, name, ship_name) DO UPDATE SET
+            count = n.count + EXCLUDED.count
+    ''',
+    'prune_fleet_ship_names': '''
+        DELETE FROM fleet_ship_names WHERE guild_id = ANY($1::bigint[]) AND count <= 0
+    ''',
+
+    # Guild membership
+    'member_guilds': '''
+        SELECT guild_id FROM guild_members WHERE user_id = $1 ORDER BY guild_id
+    ''',
+    'add_guild_member': '''
+        INSERT INTO guild_members (guild_id, user_id) VALUES ($1, $2)
+        ON CONFLICT DO NOTHING
+    ''',
+    'remove_guild_member': '''
+        DELETE FROM guild_members WHERE guild_id = $1 AND user_id = $2
+    ''',
+    'delete_guild_members': 'DELETE FROM guild_members WHERE guild_id = $1',
+    'delete_guild_aggregates': 'DELETE FROM fleet_aggregates WHERE guild_id = $1',
+    'delete_guild_ship_names': 'DELETE FROM fleet_ship_names WHERE guild_id = $1',
+    'rebuild_guild_aggregates': '''
+        INSERT INTO fleet_aggregates (
+            guild_id, manufacturer_name, name, count, lti_count, warbond_count
+        )
+        SELECT
+            $1, h.manufacturer_name, h.name,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE h.lti = true),
+            COUNT(*) FILTER (WHERE h.warbond = true)
+        FROM hangar_ships h
+        JOIN guild_members g ON g.user_id = h.user_id AND g.guild_id = $1
+        GROUP BY h.manufacturer_name, h.name
+    ''',
+    'rebuild_guild_ship_names': '''
+        INSERT INTO fleet_ship_names (guild_id, manufacturer_name, name, ship_name, count)
+        SELECT $1, h.manufacturer_name, h.name, h.ship_name, COUNT(*)
+        FROM hangar_ships h
+        JOIN guild_members g ON g.user_id = h.user_id AND g.guild_id = $1
+        WHERE h.ship_name IS NOT NULL
+        GROUP BY h.manufacturer_name, h.name, h.ship_name
+    ''',
+
+    # Readers
+    'hangar_by_user': '''
+        SELECT
+            ship_code, ship_name, manufacturer_code, manufacturer_name,
+            lti, name, warbond, entity_type, pledge_id, pledge_name,
+            pledge_date, pledge_cost
+        FROM hangar_ships
+        WHERE user_id = $1
+        ORDER BY manufacturer_name, name
+    ''',
+    'fleet_total': '''
+        SELECT
+            f.manufacturer_name, f.name, f.count, f.lti_count, f.warbond_count,
+            (
+                SELECT STRING_AGG(n.ship_name, ', ' ORDER BY n.ship_name)
+                FROM fleet_ship_names n
+                WHERE n.guild_id = f.guild_id
+                AND n.manufacturer_name = f.manufacturer_name AND n.name = f.name
+            ) as custom_names
+        FROM fleet_aggregates f
+        WHERE f.guild_id = $1
+        ORDER BY f.manufacturer_name, f.name
+    ''',
+    'ship_counts': '''
+        SELECT
+            h.user_id,
+            COUNT(*) as ship_count
+        FROM hangar_ships h
+        JOIN guild_members g ON g.user_id = h.user_id
+        WHERE g.guild_id = $1
+        GROUP BY h.user_id
+        ORDER BY COUNT(*) DESC
+    ''',
+    # Owner lookup for /forge-locate, served by idx_hangar_ships_model
+    'ship_owners': '''
+        SELECT
+            h.user_id, h.ship_name, h.lti, h.warbond,
+            h.pledge_date, h.pledge_cost, h.pledge_name
+        FROM hangar_ships h
+        JOIN guild_members g ON g.user_id = h.user_id
+        WHERE h.model_key = $1 AND g.guild_id = $2
+        ORDER BY h.pledge_date
+    ''',
+    # Ranked fuzzy search for /forge-search, served by idx_hangar_ships_search
+    'ship_search': '''
+        SELECT
+            h.user_id, h.manufacturer_name, h.name, h.ship_name,
+            h.pledge_name, h.lti, h.warbond,
+            word_similarity($1, h.search_text) AS score
+        FROM hangar_ships h
+        JOIN guild_members g ON g.user_id = h.user_id
+        WHERE $1 <% h.search_text AND g.guild_id = $2
+        ORDER BY score DESC, h.model_key, h.user_id
+        LIMIT $3
+    ''',
+    # One row per model in the aggregate table, not a scan of every ship
+    'ship_models': '''
+        SELECT manufacturer_name || ' ' || name as full_name
+        FROM fleet_aggregates
+        WHERE guild_id = $1
+        ORDER BY full_name
+    ''',
+
+    # /forge-debug
+    'debug_counts': '''
+        SELECT
+            COUNT(*) as ship_count,
+            COUNT(DISTINCT user_id) as user_count,
+            COUNT(DISTINCT manufacturer_name) as manufacturer_count
+        FROM hangar_ships
+    ''',
+    'debug_sample_ship': '''
+        SELECT ship_code, name, manufacturer_name, user_id FROM hangar_ships LIMIT 1
+    ''',
+}
+
+class StatementConnection:
+    """Runs named statements on an asyncpg connection and times each one
+
+    Wraps the connection handed out by Database.acquire so every query
+    goes through STATEMENTS and lands in the per-statement histograms.
+    """
+
+    def __init__(self, conn: asyncpg.Connection, timings: Family):
+        self.conn = conn
+        self.timings = timings
+
+    async def run(self, method, name: str, *args):
+        """Run one connection method for a named statement, timing it"""
+        start = time.perf_counter()
+        try:
+            return await method(STATEMENTS[name], *args)
+        finally:
+            self.timings[name].observe(elapsed_ms(start))
+
+    async def fetch(self, name: str, *args) -> List[asyncpg.Record]:
+        return await self.run(self.conn.fetch, name, *args)
+
+    async def fetchrow(self, name: str, *args) -> Optional[asyncpg.Record]:
+        return await self.run(self.conn.fetchrow, name, *args)
+
+    async def fetchval(self, name: str, *args):
+        return await self.run(self.conn.fetchval, name, *args)
+
+    async def execute(self, name: str, *args) -> str:
+        return await self.run(self.conn.execute, name, *args)
+
+    async def executemany(self, name: str, args) -> None:
+        return await self.run(self.conn.executemany, name, args)
+
+    async def copy_records(self, table: str, records: List[tuple], columns) -> str:
+        """COPY records into a table, timed as copy_<table>"""
+        start = time.perf_counter()
+        try:
+            return await self.conn.copy_records_to_table(table, records=records, columns=columns)
+        finally:
+            self.timings[f"copy_{table}"].observe(elapsed_ms(start))
+
+    def transaction(self):
+        """Start a transaction, or a savepoint inside one"""
+        return self.conn.transaction()
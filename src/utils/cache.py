@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+class LocalCache:
+    """Bounded in-process cache tier that sits in front of Redis
+
+    Entries expire after a per-key TTL and the least recently used entries
+    are evicted once either the entry count or the byte budget is exceeded.
+    Values are stored already decoded, so callers must not mutate them.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024, default_ttl: float = 60):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a cached value, or None if missing or expired"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, size = entry
+        if expires_at <= time.monotonic():
+            self.remove(key)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, size: int, ttl: Optional[float] = None):
+        """Store a value with its approximate encoded size in bytes"""
+        if size > self.max_bytes:
+            return
+        self.remove(key)
+        self.entries[key] = (value, time.monotonic() + (ttl or self.default_ttl), size)
+        self.bytes += size
+
+        # Evict least recently used entries until back under budget
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def remove(self, key: str):
+        """Drop a single entry if present"""
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.bytes -= entry[2]
+
+    def delete(self, *keys: str):
+        """Drop entries for the given keys"""
+        for key in keys:
+            self.remove(key)
+
+    def clear(self):
+        """Drop every entry"""
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters"""
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
@@ -29,6 +29,7 @@ CMD_UPLOAD_DESC = "Upload your hangar data from XPLOR addon JSON export"
 CMD_HANGAR_DESC = "Display your hangar contents (auto-deletes after 3 minutes)"
 CMD_FLEET_DESC = "Display total fleet counts across all members"
 CMD_LOCATE_DESC = "Find members who own a specific ship model"
+CMD_SEARCH_DESC = "Search the fleet by ship, manufacturer, custom or pledge name"
 CMD_SHIPCOUNT_DESC = "Display total ship counts per member (sorted by fleet size)"
 
 # Messages
@@ -37,12 +38,39 @@ MSG_NO_MEMBER_INFO = "This member hasn't shared their system information yet."
 MSG_COLLECTED = "System specifications have been captured. Use `/forge-system` to display them."
 MSG_ERROR_TOKEN = "Error: DISCORD_TOKEN environment variable not set"
 
+# Local (in-process) cache tier in front of Redis
+LOCAL_CACHE_MAX_ENTRIES = 2048
+LOCAL_CACHE_MAX_BYTES = 32 * 1024 * 1024  # 32 MB
+LOCAL_CACHE_TTL = 60  # Seconds
+
+# Paginated output
+PAGE_CHAR_BUDGET = 1900  # Discord messages are limited to 2000 characters
+PAGE_VIEW_TIMEOUT = 180  # Seconds, matches hangar auto-delete
+CUSTOM_NAMES_CHAR_LIMIT = 300  # Longest custom name list shown on one model line
+MESSAGE_DELETE_AFTER = 180  # Seconds before hangar and fleet messages are deleted
+
+# Ship model autocomplete
+AUTOCOMPLETE_LIMIT = 25  # Discord's maximum number of choices
+MODEL_INDEX_REFRESH = 30  # Seconds between model index version checks
+
+# Fleet search
+SEARCH_RESULT_LIMIT = 50
+
+# Upload limits
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024  # 5 MB
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
 # Hangar Messages
 MSG_UPLOAD_SUCCESS = "Successfully imported your hangar data."
+MSG_UPLOAD_DELTA = "{inserted} added, {updated} changed, {deleted} removed ({total} ships total)."
+MSG_UPLOAD_UNCHANGED = "No changes since your last upload ({total} ships total)."
+MSG_UPLOAD_TOO_LARGE = "That file is too large. Hangar exports are limited to {limit} MB."
 MSG_UPLOAD_ERROR = "Error processing hangar data. Please ensure you've uploaded a valid JSON export from XPLOR addon."
 MSG_NO_HANGAR = "No hangar data found. Use `/forge-upload` to import your ships."
 MSG_NO_MEMBER_HANGAR = "This member hasn't uploaded their hangar data yet."
 MSG_NO_FLEET_DATA = "No fleet data available. Members need to upload their hangar data first."
+MSG_FLEET_SHARED = "The fleet summary was just posted in this channel: {url}"
+MSG_NO_SEARCH_RESULTS = "No ships found matching \"{query}\"."
 
 MSG_ABOUT = """```md
 # DraXon FORGE v2.4.1
@@ -62,6 +90,7 @@ A comprehensive fleet and system management bot.
 ## Fleet Management
 • /forge-fleet       - Display total fleet counts across all members
 • /forge-locate      - Find members who own a specific ship model
+• /forge-search      - Search ships by model, custom or pledge name
 
 ## Quick Access
 • Right-click member > Apps > View System Info
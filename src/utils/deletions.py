@@ -0,0 +1,164 @@
+import asyncio
+import discord
+import heapq
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+import redis.asyncio as redis
+from utils.metrics import Registry
+
+logger = logging.getLogger('DraXon_FORGE.deletions')
+
+# Redis sorted set of "channel_id:message_id" scored by due time
+DELETION_KEY = 'forge:deletions'
+
+class DeletionScheduler:
+    """Deletes messages once their time is up, from a single worker task
+
+    Pending deletions live in a Redis sorted set so they survive restarts,
+    mirrored by an in-memory heap that tells the worker how long to sleep.
+    Messages are deleted by channel and ID rather than through the
+    interaction that sent them, so entries reloaded after a restart can
+    still be removed. Due messages are grouped per channel and bulk
+    deleted where permitted, keeping API calls down under heavy use.
+    """
+
+    def __init__(self, http, cache: redis.Redis, key: str = DELETION_KEY,
+                 metrics: Optional[Registry] = None, batch_size: int = 100,
+                 resync_interval: float = 60):
+        self.http = http
+        self.cache = cache
+        self.key = key
+        self.batch_size = batch_size
+        self.resync_interval = resync_interval
+        self.heap: List[Tuple[float, str]] = []
+        self.pending: Set[str] = set()
+        # Channels where bulk delete is not permitted, deleted one by one
+        self.single_channels: Set[int] = set()
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.last_sync = 0.0
+
+        self.metrics = metrics or Registry()
+        self.deleted = self.metrics.counter(
+            'forge_deletions_total', 'Scheduled message deletions by outcome', labels=('result',)
+        )
+        self.metrics.callback(
+            'forge_deletions_pending', 'Messages waiting to be deleted',
+            lambda: len(self.heap)
+        )
+        self.metrics.callback(
+            'forge_deletions_overdue_seconds', 'How far behind schedule the oldest pending deletion is',
+            lambda: max(0.0, time.time() - self.heap[0][0]) if self.heap else 0.0
+        )
+
+    async def schedule(self, message: discord.Message, delay: float):
+        """Delete a message after delay seconds"""
+        member = f"{message.channel.id}:{message.id}"
+        due = time.time() + delay
+        await self.cache.zadd(self.key, {member: due})
+        self.push(due, member)
+
+    def push(self, due: float, member: str):
+        """Track a pending deletion locally and wake the worker if it is now next"""
+        if member in self.pending:
+            return
+        self.pending.add(member)
+        heapq.heappush(self.heap, (due, member))
+        if self.heap[0][1] == member:
+            self.wakeup.set()
+
+    def start(self):
+        """Start the deletion worker in the background"""
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop the worker; pending deletions stay in Redis for the next start"""
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def sync(self):
+        """Pick up deletions from Redis, such as those left by a restart"""
+        entries = await self.cache.zrange(self.key, 0, -1, withscores=True)
+        for member, due in entries:
+            self.push(due, member)
+        self.last_sync = time.monotonic()
+
+    async def run(self):
+        """Sleep until the next deletion is due, then delete everything due"""
+        while True:
+            try:
+                if time.monotonic() - self.last_sync >= self.resync_interval:
+                    await self.sync()
+                delay = self.heap[0][0] - time.time() if self.heap else self.resync_interval
+                if delay > 0:
+                    self.wakeup.clear()
+                    # asyncio.wait, unlike wait_for, never swallows a cancel
+                    # that races with the wakeup
+                    waiter = asyncio.ensure_future(self.wakeup.wait())
+                    try:
+                        await asyncio.wait((waiter,), timeout=min(delay, self.resync_interval))
+                    finally:
+                        waiter.cancel()
+                    continue
+                await self.flush_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error running scheduled deletions: {e}")
+                await asyncio.sleep(5)
+
+    async def flush_due(self):
+        """Claim up to batch_size due deletions and delete them per channel"""
+        now = time.time()
+        due = []
+        while self.heap and self.heap[0][0] <= now and len(due) < self.batch_size:
+            _, member = heapq.heappop(self.heap)
+            self.pending.discard(member)
+            due.append(member)
+        if not due:
+            return
+
+        # Only the replica whose ZREM succeeds deletes each message
+        async with self.cache.pipeline(transaction=False) as pipe:
+            for member in due:
+                pipe.zrem(self.key, member)
+            claimed = await pipe.execute()
+
+        by_channel: Dict[int, List[int]] = defaultdict(list)
+        for member, removed in zip(due, claimed):
+            if removed:
+                channel_id, message_id = member.split(':')
+                by_channel[int(channel_id)].append(int(message_id))
+        for channel_id, message_ids in by_channel.items():
+            await self.delete_batch(channel_id, message_ids)
+
+    async def delete_batch(self, channel_id: int, message_ids: List[int]):
+        """Delete a channel's due messages, in one call when possible"""
+        if len(message_ids) > 1 and channel_id not in self.single_channels:
+            try:
+                await self.http.delete_messages(channel_id, message_ids)
+                self.deleted['deleted'].inc(len(message_ids))
+                return
+            except discord.Forbidden:
+                # Bulk delete needs Manage Messages and is not allowed in DMs
+                self.single_channels.add(channel_id)
+            except discord.HTTPException as e:
+                logger.debug("Bulk delete in channel %s failed, deleting singly: %s", channel_id, e)
+
+        for message_id in message_ids:
+            try:
+                await self.http.delete_message(channel_id, message_id)
+                self.deleted['deleted'].inc()
+            except discord.NotFound:
+                self.deleted['missing'].inc()
+            except discord.HTTPException as e:
+                self.deleted['failed'].inc()
+                logger.warning(f"Error deleting message {message_id} in channel {channel_id}: {e}")
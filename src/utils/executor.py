@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Optional
+
+from utils.metrics import Histogram
+
+logger = logging.getLogger('DraXon_FORGE.executor')
+
+class WorkPool:
+    """Executor pool for CPU-bound parse and render jobs
+
+    Jobs submitted here must be pure functions of their arguments so they
+    can run on either a thread or a process pool.
+    """
+
+    def __init__(self, kind: str = 'thread', workers: Optional[int] = None):
+        self.kind = kind
+        self.workers = workers
+        self.executor: Executor
+        if kind == 'process':
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        elif kind == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='forge-work')
+        else:
+            raise ValueError(f"Unknown work pool kind: {kind}")
+        logger.info(f"Work pool started ({kind}, workers={workers or 'default'})")
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """Run a job on the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    def shutdown(self):
+        """Stop accepting jobs and release the workers"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from a fixed sleep
+
+    Sustained lag means something is blocking the loop, which also delays
+    the Discord gateway heartbeat.
+    """
+
+    def __init__(self, interval: float = 0.5, samples: int = 240, lag_ms: Optional[Histogram] = None):
+        self.interval = interval
+        self.samples = deque(maxlen=samples)
+        # Every sample also lands here when exported as a metric
+        self.lag_ms = lag_ms
+        self.max_lag = 0.0
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start sampling loop lag in the background"""
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop sampling"""
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self):
+        """Sample loop lag until cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if self.lag_ms is not None:
+                self.lag_ms.observe(lag * 1000)
+
+    def stats(self) -> Dict[str, float]:
+        """Return loop lag statistics in milliseconds"""
+        if not self.samples:
+            return {'last_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        ordered = sorted(self.samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return {
+            'last_ms': self.samples[-1] * 1000,
+            'p95_ms': p95 * 1000,
+            'max_ms': self.max_lag * 1000
+        }
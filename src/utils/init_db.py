@@ -5,8 +5,10 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Add parent directory to path for imports
-sys.path.append(str(Path(__file__).parent.parent.parent))
+# Add src directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from db.migrate import migrate
 
 async def init_database():
     """Initialize the database and create required tables"""
@@ -52,26 +54,9 @@ async def init_database():
             port=DB_PORT
         )
 
-        print("Creating tables...")
-        
-        # Create system_info table
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS system_info (
-                user_id BIGINT PRIMARY KEY,
-                os TEXT NOT NULL,
-                cpu TEXT NOT NULL,
-                gpu TEXT NOT NULL,
-                memory TEXT NOT NULL,
-                storage TEXT NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Create indexes
-        await conn.execute('''
-            CREATE INDEX IF NOT EXISTS idx_system_info_updated 
-            ON system_info(updated_at)
-        ''')
+        print("Applying migrations...")
+        version = await migrate(conn)
+        print(f"Schema at version {version}")
 
         print("Database initialization complete!")
         await conn.close()
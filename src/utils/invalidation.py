@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import uuid
+from typing import Iterable, List, Optional, Tuple
+from utils.cache import LocalCache
+
+logger = logging.getLogger('DraXon_FORGE.cache')
+
+# Redis channel shared by every FORGE replica
+INVALIDATION_CHANNEL = 'forge:invalidate'
+
+def encode_message(origin: str, keys: Iterable[str]) -> str:
+    """Encode an invalidation as newline separated origin and keys"""
+    return '\n'.join([origin, *keys])
+
+def decode_message(data: str) -> Tuple[str, List[str]]:
+    """Decode an invalidation message into its origin and keys"""
+    origin, *keys = data.split('\n')
+    return origin, keys
+
+class InvalidationBus:
+    """Keeps local cache tiers consistent across replicas via Redis pub/sub
+
+    Every write publishes the keys it invalidated. Each replica listens on
+    the shared channel and evicts those keys from its own local cache.
+    Messages may be missed while disconnected, so the local cache is
+    cleared whenever the subscription is (re)established, and it is
+    bypassed entirely until then.
+    """
+
+    def __init__(self, redis_client, local: LocalCache, channel: str = INVALIDATION_CHANNEL):
+        self.redis = redis_client
+        self.local = local
+        self.channel = channel
+        self.origin = uuid.uuid4().hex[:12]
+        self.connected = False
+        self.task: Optional[asyncio.Task] = None
+        self.received = 0
+        self.reconnects = 0
+
+    def start(self):
+        """Start listening for invalidations in the background"""
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop listening"""
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.connected = False
+
+    async def publish(self, *keys: str):
+        """Tell the other replicas to evict keys"""
+        try:
+            await self.redis.publish(self.channel, encode_message(self.origin, keys))
+        except Exception as e:
+            logger.error(f"Error publishing cache invalidation: {e}")
+
+    async def run(self):
+        """Subscribe and apply invalidations, reconnecting with backoff"""
+        backoff = 1
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+
+                # Anything published while we were away was missed: resync
+                self.local.clear()
+                self.connected = True
+                backoff = 1
+                logger.info(f"Cache invalidation bus subscribed to {self.channel}")
+
+                async for message in pubsub.listen():
+                    if message['type'] != 'message':
+                        continue
+                    origin, keys = decode_message(message['data'])
+                    if origin == self.origin:
+                        continue
+                    self.received += 1
+                    self.local.delete(*keys)
+                    logger.debug("Applied invalidation of %d keys from %s", len(keys), origin, extra={'sample_every': 100})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation bus disconnected: {e}")
+            finally:
+                self.connected = False
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
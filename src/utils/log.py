@@ -0,0 +1,130 @@
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+# Attributes every LogRecord has; anything else was passed via extra=
+RECORD_ATTRS = frozenset(logging.LogRecord('', 0, '', 0, '', (), None).__dict__) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line
+
+    Fields passed with extra= are included alongside the message, so
+    values like user or guild IDs stay machine readable.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRS and key != 'sample_every':
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """Keeps one in every N records for high-frequency events
+
+    Opt in per call with extra={'sample_every': N}. Records are counted
+    per message template, so lazy %-style calls sample as one event
+    whatever their arguments. Kept records carry a 'sampled' field.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.seen: Dict[tuple, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        every = getattr(record, 'sample_every', None)
+        if not every or every <= 1:
+            return True
+        key = (record.name, record.msg)
+        count = self.seen.get(key, 0)
+        self.seen[key] = count + 1
+        if count % every:
+            return False
+        record.sampled = every
+        return True
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the event loop
+
+    Messages are formatted on the calling thread, then records are handed
+    to a bounded queue and encoded and written by a listener thread. When
+    the queue is full the record is dropped and counted rather than
+    waiting for the sink to catch up.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the args now, as the stdlib handler does, so mutable args
+        # are logged as they were at the call. Only the JSON encoding is
+        # left to the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """Parse per-logger levels like 'DraXon_FORGE.db=DEBUG,discord=WARNING'"""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, level = item.partition('=')
+        levels[name.strip()] = logging.getLevelName(level.strip().upper())
+        if not isinstance(levels[name.strip()], int):
+            raise ValueError(f"Unknown log level in {item!r}")
+    return levels
+
+def setup_logging(level: str = 'INFO', module_levels: str = '', fmt: str = 'json',
+                  queue_size: int = 10000, stream=None) -> QueueListener:
+    """Route all logging through a non-blocking queue to one stream sink
+
+    Returns the started listener; stop it on shutdown to flush the queue.
+    """
+    sink = logging.StreamHandler(stream or sys.stderr)
+    if fmt == 'json':
+        sink.setFormatter(JsonFormatter())
+    else:
+        sink.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    for name, module_level in parse_levels(module_levels).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    listener = QueueListener(handler.queue, sink, respect_handler_level=True)
+    listener.start()
+    return listener
+
+def queue_handler() -> Optional[DroppingQueueHandler]:
+    """Return the installed queue handler, if setup_logging has run"""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            return handler
+    return None
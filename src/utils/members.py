@@ -0,0 +1,52 @@
+import discord
+import logging
+from typing import Dict, Iterable
+
+logger = logging.getLogger('DraXon_FORGE.members')
+
+class MemberDirectory:
+    """Each guild's current member IDs and display names, kept from gateway events
+
+    The same events update the guild_members table, which fleet queries
+    join against, so members who have left are filtered out in SQL before
+    any rows come back. Cogs resolve the owners that remain to display
+    names here in a single pass instead of one guild lookup per row.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.guilds: Dict[int, Dict[int, str]] = {}
+
+    async def sync_guild(self, guild: discord.Guild):
+        """Load a guild's full member list and record it in the database"""
+        if not guild.chunked:
+            await guild.chunk()
+        self.guilds[guild.id] = {member.id: member.display_name for member in guild.members}
+        await self.db.sync_guild_members(guild.id, self.guilds[guild.id].keys())
+        logger.info(f"Synced {len(self.guilds[guild.id])} members for {guild.name}")
+
+    async def remove_guild(self, guild_id: int):
+        """Forget a guild the bot has left and drop its fleet data"""
+        self.guilds.pop(guild_id, None)
+        await self.db.remove_guild(guild_id)
+
+    async def member_joined(self, member: discord.Member):
+        """Add a new member and count their hangar towards the guild fleet"""
+        self.guilds.setdefault(member.guild.id, {})[member.id] = member.display_name
+        await self.db.update_guild_member(member.guild.id, member.id, joined=True)
+
+    async def member_left(self, guild_id: int, user_id: int):
+        """Remove a departed member and their hangar from the guild fleet"""
+        self.guilds.get(guild_id, {}).pop(user_id, None)
+        await self.db.update_guild_member(guild_id, user_id, joined=False)
+
+    def rename(self, guild_id: int, user_id: int, display_name: str):
+        """Record a changed display name for a current member"""
+        names = self.guilds.get(guild_id)
+        if names is not None and user_id in names:
+            names[user_id] = display_name
+
+    def resolve(self, guild_id: int, user_ids: Iterable[int]) -> Dict[int, str]:
+        """Map user IDs to display names, leaving out anyone not in the guild"""
+        names = self.guilds.get(guild_id, {})
+        return {user_id: names[user_id] for user_id in user_ids if user_id in names}
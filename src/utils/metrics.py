@@ -0,0 +1,237 @@
+import bisect
+import logging
+import time
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+from aiohttp import web
+
+logger = logging.getLogger('DraXon_FORGE.metrics')
+
+# Upper bounds in milliseconds, spanning a fast cache hit to a slow query
+DEFAULT_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+class Histogram:
+    """Fixed-bucket latency histogram
+
+    Observations are counted into buckets rather than stored, so memory
+    stays constant however many are recorded. Quantiles are estimated by
+    interpolating within the bucket that contains them.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(sorted(buckets))
+        # One extra slot for observations above the last bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Record one observation"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-th quantile (0-1) of the observations"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return summary statistics"""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'max': self.max
+        }
+
+def elapsed_ms(start: float) -> float:
+    """Milliseconds since a time.perf_counter() reading"""
+    return (time.perf_counter() - start) * 1000
+
+class Counter:
+    """Monotonically increasing count"""
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        """Add to the count"""
+        self.value += amount
+
+class Family:
+    """A metric split by label values, one child per combination
+
+    Children are created on first use, so hot paths can index a family
+    directly. Label values must come from a small fixed set, such as
+    statement or command names, never user or guild IDs.
+    """
+
+    def __init__(self, name: str, help_text: str, kind: str, labels: Sequence[str], factory: Callable):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.labels = tuple(labels)
+        self.factory = factory
+        self.children: Dict[Tuple, object] = {}
+
+    def __getitem__(self, values: Union[str, Tuple]):
+        if not isinstance(values, tuple):
+            values = (values,)
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = self.factory()
+        return child
+
+    def items(self) -> Iterator[Tuple[Union[str, Tuple], object]]:
+        """Yield (label values, child) pairs, unwrapping single labels"""
+        for values, child in list(self.children.items()):
+            yield (values[0] if len(values) == 1 else values), child
+
+class Callback:
+    """A metric read from a function at scrape time
+
+    The function returns a number, or a dict of label values to numbers.
+    Used for values another object already tracks, like pool sizes.
+    """
+
+    def __init__(self, name: str, help_text: str, kind: str, labels: Sequence[str], func: Callable):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.labels = tuple(labels)
+        self.func = func
+
+    def samples(self) -> Iterator[Tuple[Tuple, float]]:
+        values = self.func()
+        if not isinstance(values, dict):
+            yield (), values
+            return
+        for key, value in values.items():
+            yield (key if isinstance(key, tuple) else (key,)), value
+
+def escape(value) -> str:
+    """Escape a label value for the Prometheus text format"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def label_str(names: Sequence[str], values: Sequence, extra: str = '') -> str:
+    """Format a label set, with an optional pre-formatted extra label"""
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Registry:
+    """Named metrics rendered in the Prometheus text exposition format
+
+    Recording is a dict lookup plus an addition, cheap enough to leave on
+    in production. All formatting work happens when /metrics is scraped.
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, Union[Family, Callback]] = {}
+
+    def add(self, metric: Union[Family, Callback]):
+        """Register a metric, returning the existing one for a repeated name"""
+        existing = self.metrics.get(metric.name)
+        if existing is not None:
+            if existing.kind != metric.kind or existing.labels != metric.labels:
+                raise ValueError(f"Metric {metric.name} already registered with a different shape")
+            return existing
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Family:
+        """Get or create a counter family"""
+        return self.add(Family(name, help_text, 'counter', labels, Counter))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS_MS) -> Family:
+        """Get or create a histogram family"""
+        return self.add(Family(name, help_text, 'histogram', labels, lambda: Histogram(buckets)))
+
+    def callback(self, name: str, help_text: str, func: Callable,
+                 kind: str = 'gauge', labels: Sequence[str] = ()) -> Callback:
+        """Register a gauge or counter read from func at scrape time"""
+        return self.add(Callback(name, help_text, kind, labels, func))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format"""
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if isinstance(metric, Callback):
+                try:
+                    samples = list(metric.samples())
+                except Exception as e:
+                    logger.error(f"Error collecting metric {metric.name}: {e}")
+                    continue
+                for values, value in samples:
+                    lines.append(f"{metric.name}{label_str(metric.labels, values)} {format_value(value)}")
+            elif metric.kind == 'counter':
+                for values, child in list(metric.children.items()):
+                    lines.append(f"{metric.name}{label_str(metric.labels, values)} {format_value(child.value)}")
+            else:
+                for values, child in list(metric.children.items()):
+                    cumulative = 0
+                    for bound, count in zip(child.buckets + (float('inf'),), child.counts):
+                        cumulative += count
+                        le = f'le="{format_value(bound)}"'
+                        lines.append(f"{metric.name}_bucket{label_str(metric.labels, values, le)} {cumulative}")
+                    labels = label_str(metric.labels, values)
+                    lines.append(f"{metric.name}_sum{labels} {format_value(child.total)}")
+                    lines.append(f"{metric.name}_count{labels} {child.count}")
+        lines.append('')
+        return '\n'.join(lines)
+
+class MetricsServer:
+    """Serves a registry on a local HTTP /metrics endpoint"""
+
+    def __init__(self, registry: Registry, host: str = '127.0.0.1', port: int = 9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.runner: Optional[web.AppRunner] = None
+
+    async def start(self):
+        """Start listening in the background on the bot's event loop"""
+        app = web.Application()
+        app.router.add_get('/metrics', self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        logger.info(f"Metrics endpoint listening on http://{self.host}:{self.port}/metrics")
+
+    async def handle(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.render().encode(),
+            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+        )
+
+    async def stop(self):
+        """Stop listening"""
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
@@ -0,0 +1,232 @@
+import asyncio
+import discord
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from utils.metrics import Registry, elapsed_ms
+
+logger = logging.getLogger('DraXon_FORGE.outbound')
+
+# Lower runs first: replies the user is waiting on, then public posts,
+# then cleanup that can wait
+PRIORITY_REPLY = 0
+PRIORITY_PUBLIC = 1
+PRIORITY_CLEANUP = 2
+
+PRIORITY_NAMES = {PRIORITY_REPLY: 'reply', PRIORITY_PUBLIC: 'public', PRIORITY_CLEANUP: 'cleanup'}
+
+# (tokens per second, burst) for each kind of route, kept under
+# Discord's published limits so requests rarely meet a 429
+ROUTE_LIMITS = {
+    'webhook': (5.0, 5),   # Followups, per interaction
+    'delete': (1.0, 5),    # Message deletes, per channel
+}
+GLOBAL_LIMIT = (45.0, 45)
+
+# Interaction webhooks are exempt from the global limit; bot token calls are not
+GLOBAL_ROUTES = {'delete'}
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of refusing
+
+    Each reservation takes a token, going into debt if none are left, and
+    returns how long the caller must wait for that token to exist.
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token, returning the seconds until it is available"""
+        self.refill()
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    @property
+    def idle(self) -> bool:
+        """Whether the bucket is full, so dropping it loses nothing"""
+        self.refill()
+        return self.tokens >= self.capacity
+
+class Job:
+    __slots__ = ('route', 'priority', 'call', 'future', 'submitted', 'reserved')
+
+    def __init__(self, route: Tuple, priority: int, call: Callable[[], Awaitable]):
+        self.route = route
+        self.priority = priority
+        self.call = call
+        self.future = asyncio.get_running_loop().create_future()
+        self.submitted = time.perf_counter()
+        self.reserved = False
+
+class Outbound:
+    """Rate-limited, prioritised queue for the bot's Discord API calls
+
+    Calls wait for both a per-route and a global token bucket before they
+    run, so bursts are spread out here instead of being retried by
+    discord.py after a 429. A job still waiting on its bucket is parked on
+    a timer rather than holding a worker, so replies are never stuck
+    behind cleanup for a busy channel. At most max_pending jobs are in
+    flight; further submitters wait, which slows the deletion worker
+    rather than growing the queue without bound.
+    """
+
+    def __init__(self, http=None, metrics: Optional[Registry] = None, workers: int = 4,
+                 max_pending: int = 1000, coalesce_window: float = 5.0):
+        self.http = http
+        self.workers = workers
+        self.coalesce_window = coalesce_window
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self.slots = asyncio.Semaphore(max_pending)
+        self.sequence = itertools.count()
+        self.buckets: Dict[Tuple, TokenBucket] = {}
+        self.global_bucket = TokenBucket(*GLOBAL_LIMIT)
+        self.recent: Dict[Hashable, Tuple[float, asyncio.Future]] = {}
+        self.tasks: List[asyncio.Task] = []
+        self.pending = 0
+
+        self.metrics = metrics or Registry()
+        self.wait_ms = self.metrics.histogram(
+            'forge_outbound_wait_milliseconds', 'Time outbound calls spend queued', labels=('priority',)
+        )
+        self.requests = self.metrics.counter(
+            'forge_outbound_requests_total', 'Outbound Discord calls by route and outcome', labels=('route', 'result')
+        )
+        self.coalesced = self.metrics.counter(
+            'forge_outbound_coalesced_total', 'Sends answered by an identical send already made'
+        )[()]
+        self.metrics.callback(
+            'forge_outbound_pending', 'Outbound calls queued or running',
+            lambda: self.pending
+        )
+
+    def start(self):
+        """Start the worker tasks"""
+        if not self.tasks:
+            self.tasks = [asyncio.create_task(self.work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Stop the workers and fail anything still queued"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        while not self.queue.empty():
+            _, _, job = self.queue.get_nowait()
+            if not job.future.done():
+                job.future.cancel()
+
+    async def submit(self, route: Tuple, call: Callable[[], Awaitable], priority: int = PRIORITY_REPLY):
+        """Queue an API call on a route and wait for its result"""
+        await self.slots.acquire()
+        self.pending += 1
+        job = Job(route, priority, call)
+        self.queue.put_nowait((priority, next(self.sequence), job))
+        try:
+            return await job.future
+        finally:
+            self.pending -= 1
+            self.slots.release()
+
+    def reserve(self, route: Tuple) -> float:
+        """Reserve a token on a route and the global bucket, returning the wait"""
+        bucket = self.buckets.get(route)
+        if bucket is None:
+            if len(self.buckets) > 1000:
+                self.buckets = {key: b for key, b in self.buckets.items() if not b.idle}
+            bucket = self.buckets[route] = TokenBucket(*ROUTE_LIMITS[route[0]])
+        if route[0] in GLOBAL_ROUTES:
+            return max(bucket.reserve(), self.global_bucket.reserve())
+        return bucket.reserve()
+
+    async def work(self):
+        """Run queued calls in priority order as their buckets allow"""
+        loop = asyncio.get_running_loop()
+        while True:
+            priority, sequence, job = await self.queue.get()
+            if job.future.done():
+                continue
+            if not job.reserved:
+                job.reserved = True
+                wait = self.reserve(job.route)
+                if wait > 0:
+                    # Requeue once its token exists, keeping its place in line
+                    loop.call_later(wait, self.queue.put_nowait, (priority, sequence, job))
+                    continue
+
+            self.wait_ms[PRIORITY_NAMES[priority]].observe(elapsed_ms(job.submitted))
+            try:
+                result = await job.call()
+            except asyncio.CancelledError:
+                job.future.cancel()
+                raise
+            except Exception as e:
+                self.requests[job.route[0], type(e).__name__].inc()
+                if not job.future.done():
+                    job.future.set_exception(e)
+            else:
+                self.requests[job.route[0], 'ok'].inc()
+                if not job.future.done():
+                    job.future.set_result(result)
+
+    async def followup(self, interaction: discord.Interaction, *args, **kwargs):
+        """Send an interaction followup; ephemeral replies jump the queue"""
+        ephemeral = kwargs.get('ephemeral', False)
+        return await self.submit(
+            ('webhook', interaction.id),
+            lambda: interaction.followup.send(*args, **kwargs),
+            PRIORITY_REPLY if ephemeral else PRIORITY_PUBLIC
+        )
+
+    async def coalesce(self, key: Hashable, send: Callable[[], Awaitable]):
+        """Run send unless a send under the same key ran within the window
+
+        Returns (result, sent): the result that answers the request, and
+        whether this call produced it or joined one already made.
+        """
+        now = time.monotonic()
+        entry = self.recent.get(key)
+        if entry and entry[0] > now:
+            self.coalesced.inc()
+            return await asyncio.shield(entry[1]), False
+
+        if len(self.recent) > 256:
+            self.recent = {k: v for k, v in self.recent.items() if v[0] > now}
+        future = asyncio.ensure_future(send())
+        self.recent[key] = (now + self.coalesce_window, future)
+        future.add_done_callback(lambda done: self.forget_failed(key, done))
+        return await asyncio.shield(future), True
+
+    def forget_failed(self, key: Hashable, future: asyncio.Future):
+        """Drop a failed send so the next identical request retries it"""
+        if future.cancelled() or future.exception() is not None:
+            entry = self.recent.get(key)
+            if entry and entry[1] is future:
+                del self.recent[key]
+
+    async def delete_original_response(self, interaction: discord.Interaction):
+        """Remove an interaction's deferred response"""
+        return await self.submit(('webhook', interaction.id), interaction.delete_original_response)
+
+    async def delete_message(self, channel_id: int, message_id: int):
+        """Delete one message as low priority cleanup"""
+        return await self.submit(
+            ('delete', channel_id), lambda: self.http.delete_message(channel_id, message_id), PRIORITY_CLEANUP
+        )
+
+    async def delete_messages(self, channel_id: int, message_ids: List[int]):
+        """Bulk delete a channel's messages as low priority cleanup"""
+        return await self.submit(
+            ('delete', channel_id), lambda: self.http.delete_messages(channel_id, message_ids), PRIORITY_CLEANUP
+        )
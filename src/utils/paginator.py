@@ -0,0 +1,90 @@
+import discord
+from typing import Hashable, Optional, Set, Tuple
+from utils.constants import PAGE_VIEW_TIMEOUT
+from utils.outbound import Outbound
+from utils.render import Pages
+
+class PaginatedView(discord.ui.View):
+    """Prev/next buttons for browsing a Pages result
+
+    Only members who ran the command can turn the pages, including those
+    whose identical request was answered with this message.
+    """
+
+    def __init__(self, pages: Pages, owner_id: int):
+        super().__init__(timeout=PAGE_VIEW_TIMEOUT)
+        self.pages = pages
+        self.owner_ids: Set[int] = {owner_id}
+        self.index = 0
+        self.update_buttons()
+
+    def update_buttons(self):
+        """Refresh the page label and button states"""
+        total = self.pages.total
+        self.counter.label = f"{self.index + 1}/{total or '?'}"
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = total is not None and self.index >= total - 1
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id not in self.owner_ids:
+            await interaction.response.send_message(
+                "Only members who ran this command can change pages.",
+                ephemeral=True
+            )
+            return False
+        return True
+
+    async def show(self, interaction: discord.Interaction, index: int):
+        """Render a page and edit the message to show it"""
+        content = self.pages.page(index)
+        if content is None:
+            # Stepped past the end; the page count is now known
+            index = self.pages.total - 1
+            content = self.pages.page(index)
+        self.index = index
+        self.update_buttons()
+        await interaction.response.edit_message(content=content, view=self)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.index - 1)
+
+    @discord.ui.button(label="1/?", style=discord.ButtonStyle.secondary, disabled=True)
+    async def counter(self, interaction: discord.Interaction, button: discord.ui.Button):
+        pass
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.index + 1)
+
+def page_view(pages: Pages, owner_id: int) -> Optional[PaginatedView]:
+    """Build a view for multi-page output, or None if it fits on one page"""
+    pages.page(1)
+    if pages.total == 1:
+        return None
+    return PaginatedView(pages, owner_id)
+
+async def send_pages(outbound: Outbound, interaction: discord.Interaction, pages: Pages, **kwargs):
+    """Send the first page as a followup, with paging buttons if needed"""
+    view = page_view(pages, interaction.user.id)
+    if view:
+        kwargs['view'] = view
+    return await outbound.followup(interaction, pages.page(0), **kwargs)
+
+async def share_pages(outbound: Outbound, interaction: discord.Interaction, pages: Pages,
+                      key: Hashable) -> Tuple[discord.Message, bool]:
+    """Send pages unless the same pages were just sent under key
+
+    Returns (message, sent). When an earlier send is reused, this member
+    is allowed to turn its pages, and the caller should point them to it.
+    """
+    async def send():
+        view = page_view(pages, interaction.user.id)
+        if view:
+            return await outbound.followup(interaction, pages.page(0), view=view), view
+        return await outbound.followup(interaction, pages.page(0)), None
+
+    (message, view), sent = await outbound.coalesce(key, send)
+    if view:
+        view.owner_ids.add(interaction.user.id)
+    return message, sent
@@ -0,0 +1,181 @@
+"""
+Text renderers for hangar and fleet displays.
+Summaries and line builders are pure functions so they can run on the
+bot's work pool; Pages splits their output into Discord-sized messages
+on demand.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional
+from utils.constants import CUSTOM_NAMES_CHAR_LIMIT, PAGE_CHAR_BUDGET
+
+def format_count_status(count: int, lti_count: int, wb_count: int) -> str:
+    """Format LTI and Warbond counts for a group of ships"""
+    status = []
+    if lti_count == count:
+        status.append("LTI")
+    elif lti_count > 0:
+        status.append(f"{lti_count}LTI")
+    if wb_count > 0:
+        status.append(f"{wb_count}WB")
+    return f" [{'+'.join(status)}]" if status else ""
+
+def custom_names_str(names: str) -> str:
+    """Format a model's custom names, shortened so one line stays readable"""
+    if not names:
+        return ""
+    if len(names) > CUSTOM_NAMES_CHAR_LIMIT:
+        names = names[:CUSTOM_NAMES_CHAR_LIMIT - 1] + "…"
+    return f' ("{names}")'
+
+# Bump when the summary layout changes so stored summaries are rebuilt
+SUMMARY_VERSION = 1
+
+def hangar_summary(ships: List[Dict]) -> Dict:
+    """Group a member's ships into the compact summary hangar views render
+
+    Manufacturers and models are pre-sorted. Each model row is
+    [name, count, lti_count, wb_count, custom_names], built in one pass.
+    """
+    groups = defaultdict(dict)
+    for ship in ships:
+        models = groups[ship['manufacturer_name']]
+        row = models.get(ship['name'])
+        if row is None:
+            row = models[ship['name']] = [ship['name'], 0, 0, 0, []]
+        row[1] += 1
+        row[2] += bool(ship['lti'])
+        row[3] += bool(ship['warbond'])
+        if ship['ship_name'] and ship['ship_name'] != ship['name']:
+            row[4].append(ship['ship_name'])
+
+    manufacturers = []
+    for manufacturer in sorted(groups):
+        rows = sorted(groups[manufacturer].values(), key=lambda row: row[0])
+        for row in rows:
+            row[4].sort()
+        manufacturers.append([manufacturer, rows])
+
+    return {
+        'version': SUMMARY_VERSION,
+        'total': len(ships),
+        'manufacturers': manufacturers
+    }
+
+def summary_lines(summary: Dict) -> List[str]:
+    """Build the markdown lines for a member's hangar from its summary"""
+    lines = []
+
+    for manufacturer, rows in summary['manufacturers']:
+        lines.append(f"## {manufacturer}")
+
+        for base_name, count, lti_count, wb_count, custom_names in rows:
+            status_str = format_count_status(count, lti_count, wb_count)
+            custom_str = custom_names_str(", ".join(custom_names))
+            lines.append(f"* {count:2d} × {base_name}{status_str}{custom_str}")
+
+        lines.append("")  # Add spacing between manufacturers
+
+    # Add total count
+    lines.extend([
+        "# Summary",
+        f"* Total Ships: {summary['total']}"
+    ])
+
+    return lines
+
+def fleet_lines(fleet_data: Dict[str, Dict]) -> List[str]:
+    """Build the markdown lines for the organization fleet summary"""
+    # Group by manufacturer
+    manu_groups = defaultdict(list)
+    for ship_name, data in fleet_data.items():
+        manufacturer = data['manufacturer_name']
+        manu_groups[manufacturer].append((ship_name, data))
+
+    lines = []
+
+    # Sort manufacturers
+    for manufacturer in sorted(manu_groups.keys()):
+        lines.append(f"## {manufacturer}")
+
+        # Sort ships within manufacturer
+        for ship_name, data in sorted(manu_groups[manufacturer], key=lambda item: item[0]):
+            count = data['count']
+            status_str = format_count_status(count, data['lti_count'], data['warbond_count'])
+
+            # Format custom names
+            custom_str = custom_names_str(data.get('custom_names'))
+
+            lines.append(f"* {count:2d} × {ship_name}{status_str}{custom_str}")
+
+        lines.append("")  # Add spacing between manufacturers
+
+    # Add total count
+    total_ships = sum(data['count'] for data in fleet_data.values())
+    lines.extend([
+        "# Summary",
+        f"* Total Fleet Size: {total_ships} ships"
+    ])
+
+    return lines
+
+class Pages:
+    """Splits rendered lines into markdown pages that fit a Discord message
+
+    Pages are cut on demand as they are first requested, so showing page 1
+    of a large fleet doesn't pay for laying out every other page. A page
+    that starts inside a manufacturer section repeats its heading.
+    """
+
+    def __init__(self, title: str, lines: List[str], budget: int = PAGE_CHAR_BUDGET):
+        self.title = title
+        self.lines = lines
+        self.budget = budget
+        self.pages: List[str] = []
+        self.position = 0
+        self.section: Optional[str] = None
+        self.size = sum(len(line) + 1 for line in lines)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every page has been laid out"""
+        return self.position >= len(self.lines) and bool(self.pages)
+
+    @property
+    def total(self) -> Optional[int]:
+        """Number of pages, or None until every page has been laid out"""
+        return len(self.pages) if self.complete else None
+
+    def page(self, index: int) -> Optional[str]:
+        """Return page index (0-based), laying out pages up to it if needed"""
+        while len(self.pages) <= index and not self.complete:
+            self.pages.append(self.layout_next())
+        return self.pages[index] if index < len(self.pages) else None
+
+    def layout_next(self) -> str:
+        """Cut the next page from the remaining lines"""
+        head = ["```md", f"# {self.title}", ""]
+        body = []
+        if self.section and self.position < len(self.lines) and not self.lines[self.position].startswith("#"):
+            body.append(f"{self.section} (cont.)")
+
+        # Room left once the header and closing fence are accounted for
+        room = self.budget - sum(len(line) + 1 for line in head) - len("```")
+        used = sum(len(line) + 1 for line in body)
+        placed = False
+
+        while self.position < len(self.lines):
+            line = self.lines[self.position]
+            if used + len(line) + 1 > room:
+                if placed:
+                    break
+                # A single line longer than a page is truncated
+                line = line[:max(0, room - used - 2)] + "…"
+            body.append(line)
+            placed = True
+            used += len(line) + 1
+            if line.startswith("## "):
+                self.section = line
+            self.position += 1
+
+        return "\n".join(head + body + ["```"])
@@ -0,0 +1,144 @@
+import asyncio
+import bisect
+import logging
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger('DraXon_FORGE.search')
+
+def fold(text: str) -> str:
+    """Normalize text for case-insensitive matching"""
+    return ' '.join(text.casefold().split())
+
+def trigrams(text: str) -> Set[str]:
+    """Return the set of three character substrings of folded text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class ModelIndex:
+    """In-memory prefix and trigram index over ship model names
+
+    Prefix matches come from a sorted list via bisection; substring
+    matches narrow candidates by intersecting trigram postings. Names are
+    added and removed individually, so refreshing after an upload only
+    touches the models that changed.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: Dict[str, str] = {}
+        self.keys: List[str] = []
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+        self.update(names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str):
+        """Index a model name"""
+        key = fold(name)
+        if key in self.names:
+            return
+        self.names[key] = name
+        bisect.insort(self.keys, key)
+        for gram in trigrams(key):
+            self.postings[gram].add(key)
+
+    def discard(self, name: str):
+        """Remove a model name from the index"""
+        key = fold(name)
+        if self.names.pop(key, None) is None:
+            return
+        del self.keys[bisect.bisect_left(self.keys, key)]
+        for gram in trigrams(key):
+            keys = self.postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
+
+    def update(self, names: Iterable[str]):
+        """Make the index hold exactly names, applying only the difference"""
+        wanted = {fold(name): name for name in names}
+        for key in [key for key in self.names if key not in wanted]:
+            self.discard(self.names[key])
+        for key, name in wanted.items():
+            if key not in self.names:
+                self.add(name)
+
+    def search(self, query: str, limit: int = 25) -> List[str]:
+        """Return up to limit names, prefix matches first, then substrings"""
+        query = fold(query)
+        start = bisect.bisect_left(self.keys, query)
+        results = []
+        for key in self.keys[start:start + limit]:
+            if not key.startswith(query):
+                break
+            results.append(key)
+        if len(results) >= limit or len(query) < 2:
+            return [self.names[key] for key in results]
+
+        # Fill the remainder with names containing the query elsewhere
+        if len(query) >= 3:
+            postings = sorted((self.postings.get(gram, set()) for gram in trigrams(query)), key=len)
+            candidates = set.intersection(*postings) if postings else set()
+        else:
+            candidates = self.names.keys()
+        seen = set(results)
+        for key in sorted(key for key in candidates if query in key and key not in seen):
+            results.append(key)
+            if len(results) >= limit:
+                break
+        return [self.names[key] for key in results]
+
+class ModelIndexes:
+    """Per-guild model indexes that refresh in the background when stale
+
+    Lookups always answer from the index already in memory. An index is
+    checked against the data version of its source at most once every
+    refresh interval, or straight away after mark_stale, and refreshed by
+    a background task so keystrokes never wait on Redis or the database.
+    """
+
+    def __init__(self, loader: Callable[[int], Awaitable[Iterable[str]]],
+                 versioner: Callable[[int], Awaitable[int]], refresh_interval: float = 30):
+        self.loader = loader
+        self.versioner = versioner
+        self.refresh_interval = refresh_interval
+        self.indexes: Dict[int, ModelIndex] = {}
+        self.versions: Dict[int, int] = {}
+        self.checked_at: Dict[int, float] = {}
+        self.refreshing: Dict[int, asyncio.Task] = {}
+
+    async def get(self, guild_id: int) -> ModelIndex:
+        """Return a guild's index, building it on first use"""
+        index = self.indexes.get(guild_id)
+        if index is None:
+            await self.refresh(guild_id)
+            return self.indexes[guild_id]
+
+        if time.monotonic() - self.checked_at.get(guild_id, 0) >= self.refresh_interval:
+            if guild_id not in self.refreshing:
+                task = asyncio.create_task(self.refresh(guild_id))
+                self.refreshing[guild_id] = task
+                task.add_done_callback(lambda _: self.refreshing.pop(guild_id, None))
+        return index
+
+    def mark_stale(self, guild_id: Optional[int] = None):
+        """Force a version check on next use, for one guild or all of them"""
+        if guild_id is None:
+            self.checked_at.clear()
+        else:
+            self.checked_at.pop(guild_id, None)
+
+    async def refresh(self, guild_id: int):
+        """Bring a guild's index up to date with its current models"""
+        self.checked_at[guild_id] = time.monotonic()
+        try:
+            version = await self.versioner(guild_id)
+            if guild_id in self.indexes and self.versions.get(guild_id) == version:
+                return
+            names = await self.loader(guild_id)
+            self.indexes.setdefault(guild_id, ModelIndex()).update(names)
+            self.versions[guild_id] = version
+        except Exception as e:
+            logger.error(f"Error refreshing model index for guild {guild_id}: {e}")
+            self.indexes.setdefault(guild_id, ModelIndex())
@@ -0,0 +1,110 @@
+import json
+import zlib
+from typing import Any, Optional, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# First byte of every encoded value. Bump when the packed layout changes;
+# values written under another version read as cache misses.
+CACHE_SCHEMA_VERSION = 2
+
+# Codec used unless CACHE_CODEC says otherwise
+DEFAULT_CODEC = 'msgpack' if msgpack is not None else 'json'
+
+# Second byte: codec id in the low bits, compression flag in the high bit
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+FLAG_COMPRESSED = 0x80
+
+def pack(value: Any) -> list:
+    """Convert uniform records to a columnar layout
+
+    A list of dicts sharing the same keys becomes ['r', columns, rows] and a
+    dict of such dicts becomes ['m', columns, keys, rows], so field names
+    are stored once instead of once per record. Anything else is wrapped
+    as ['v', value].
+    """
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        columns = list(value[0])
+        if all(list(item) == columns for item in value):
+            return ['r', columns, [[item[column] for column in columns] for item in value]]
+
+    if isinstance(value, dict) and value and all(isinstance(item, dict) for item in value.values()):
+        items = list(value.values())
+        columns = list(items[0])
+        if all(list(item) == columns for item in items):
+            return ['m', columns, list(value), [[item[column] for column in columns] for item in items]]
+
+    return ['v', value]
+
+def unpack(packed: list) -> Any:
+    """Rebuild the original value from pack's layout"""
+    kind = packed[0]
+    if kind == 'r':
+        _, columns, rows = packed
+        return [dict(zip(columns, row)) for row in rows]
+    if kind == 'm':
+        _, columns, keys, rows = packed
+        return {key: dict(zip(columns, row)) for key, row in zip(keys, rows)}
+    return packed[1]
+
+class CacheSerializer:
+    """Encodes cache values as versioned and optionally compressed bytes
+
+    Values are encoded with JSON or msgpack, and compressed with zlib once
+    they reach compress_threshold bytes. msgpack bodies are packed
+    column-wise first; JSON bodies are not, since rebuilding records in
+    Python decodes slower than json's own parser building them. A two
+    byte header records the schema version and how the body was encoded,
+    so any replica can read what another wrote regardless of its own
+    settings. Values without a header are read as plain JSON.
+    """
+
+    def __init__(self, codec: str = 'json', compress_threshold: Optional[int] = None):
+        if codec == 'msgpack' and msgpack is None:
+            raise RuntimeError("msgpack cache codec requested but msgpack is not installed")
+        if codec not in ('json', 'msgpack'):
+            raise ValueError(f"Unknown cache codec: {codec}")
+        self.codec = CODEC_MSGPACK if codec == 'msgpack' else CODEC_JSON
+        self.compress_threshold = compress_threshold
+
+    @property
+    def binary(self) -> bool:
+        """Whether encoded values may not be valid UTF-8"""
+        return self.codec == CODEC_MSGPACK or self.compress_threshold is not None
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value for storage"""
+        if self.codec == CODEC_MSGPACK:
+            body = msgpack.packb(pack(value), use_bin_type=True)
+        else:
+            body = json.dumps(value, separators=(',', ':')).encode()
+
+        flags = self.codec
+        if self.compress_threshold is not None and len(body) >= self.compress_threshold:
+            body = zlib.compress(body)
+            flags |= FLAG_COMPRESSED
+        return bytes((CACHE_SCHEMA_VERSION, flags)) + body
+
+    def loads(self, raw: Union[bytes, str]) -> Optional[Any]:
+        """Decode a stored value, or return None if it was written under another schema"""
+        if isinstance(raw, str):
+            raw = raw.encode()
+        if raw[:1] in (b'[', b'{'):
+            # Written before versioned encoding
+            return json.loads(raw)
+        if raw[0] != CACHE_SCHEMA_VERSION:
+            return None
+
+        flags = raw[1]
+        body = raw[2:]
+        if flags & FLAG_COMPRESSED:
+            body = zlib.decompress(body)
+        if flags & ~FLAG_COMPRESSED == CODEC_MSGPACK:
+            if msgpack is None:
+                return None
+            return unpack(msgpack.unpackb(body, raw=False))
+        return json.loads(body)
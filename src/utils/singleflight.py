@@ -0,0 +1,36 @@
+import asyncio
+from typing import Awaitable, Callable, Dict
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution
+
+    The first caller for a key starts the work; callers arriving while it
+    is still running await the same result instead of repeating it. The
+    work runs as its own task, so a cancelled caller doesn't cancel it for
+    everyone else.
+    """
+
+    def __init__(self):
+        self.calls: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable]):
+        """Run func for key, or join the call already in flight"""
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self.calls[key] = task
+            task.add_done_callback(lambda done: self.finish(key, done))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def finish(self, key: str, task: asyncio.Task):
+        """Forget a completed call so the next miss starts a fresh one"""
+        if self.calls.get(key) is task:
+            del self.calls[key]
+        # Mark the exception retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,138 @@
+import codecs
+import json
+from typing import Dict, List, Optional
+
+# Keys every XPLOR ship record must provide (ship_name is optional)
+REQUIRED_SHIP_KEYS = (
+    'ship_code', 'manufacturer_code', 'manufacturer_name', 'lti', 'name',
+    'warbond', 'entity_type', 'pledge_id', 'pledge_name', 'pledge_date',
+    'pledge_cost'
+)
+
+# Required keys stored in NOT NULL text columns, so they must be strings
+REQUIRED_TEXT_KEYS = tuple(key for key in REQUIRED_SHIP_KEYS if key not in ('lti', 'warbond'))
+
+# Largest single ship record accepted before the stream is rejected
+MAX_RECORD_BYTES = 16 * 1024
+
+# Number of per-record errors kept for reporting back to the user
+MAX_REPORTED_ERRORS = 10
+
+def validate_ship(ship) -> Optional[str]:
+    """Check a decoded ship record, returning an error message if invalid"""
+    if not isinstance(ship, dict):
+        return "not a ship object"
+    missing = [key for key in REQUIRED_SHIP_KEYS if key not in ship]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    if not isinstance(ship['lti'], bool) or not isinstance(ship['warbond'], bool):
+        return "lti and warbond must be true or false"
+    not_text = [key for key in REQUIRED_TEXT_KEYS if not isinstance(ship[key], str)]
+    if not_text:
+        return f"{', '.join(not_text)} must be text"
+    if not isinstance(ship.get('ship_name'), (str, type(None))):
+        return "ship_name must be text or null"
+    return None
+
+class ShiplistParser:
+    """Incremental parser for XPLOR shiplist.json exports
+
+    The export is a single JSON array of ship objects. Chunks of raw bytes
+    are fed in as they are downloaded and every complete, valid ship is
+    returned as soon as it has been decoded, so the whole file never has
+    to be held in memory.
+    """
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.text = codecs.getincrementaldecoder('utf-8-sig')()
+        self.buffer = ''
+        self.state = 'start'  # start -> first -> value <-> separator -> done
+        self.index = 0
+        self.valid_count = 0
+        self.error_count = 0
+        self.errors: List[str] = []
+        self.fatal: Optional[str] = None
+
+    def fail(self, message: str):
+        """Record a fatal parse error and abort the stream"""
+        self.fatal = message
+        raise ValueError(message)
+
+    def record_error(self, message: str):
+        """Record a per-ship validation error"""
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Ship #{self.index}: {message}")
+
+    def feed(self, chunk: bytes) -> List[Dict]:
+        """Consume a chunk of the export and return the valid ships it completed"""
+        try:
+            self.buffer += self.text.decode(chunk)
+        except UnicodeDecodeError:
+            self.fail("File is not valid UTF-8")
+        return self.drain()
+
+    def drain(self) -> List[Dict]:
+        """Decode as many complete records as the buffer holds"""
+        ships = []
+        buffer = self.buffer
+        pos = 0
+        length = len(buffer)
+
+        while True:
+            # Skip whitespace between tokens
+            while pos < length and buffer[pos] in ' \t\r\n':
+                pos += 1
+            if pos >= length:
+                break
+
+            char = buffer[pos]
+            if self.state == 'start':
+                if char != '[':
+                    self.fail("Expected a JSON array of ships")
+                self.state = 'first'
+                pos += 1
+            elif self.state == 'separator':
+                if char == ',':
+                    self.state = 'value'
+                elif char == ']':
+                    self.state = 'done'
+                else:
+                    self.fail(f"Expected ',' or ']' after ship #{self.index}")
+                pos += 1
+            elif self.state == 'done':
+                self.fail("Unexpected data after the ship list")
+            elif char == ']' and self.state == 'first':
+                self.state = 'done'
+                pos += 1
+            else:
+                try:
+                    ship, end = self.decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Most likely an incomplete record; wait for more data
+                    if length - pos > MAX_RECORD_BYTES:
+                        self.fail(f"Ship #{self.index + 1} is malformed or too large")
+                    break
+
+                self.index += 1
+                error = validate_ship(ship)
+                if error:
+                    self.record_error(error)
+                else:
+                    self.valid_count += 1
+                    ships.append(ship)
+                self.state = 'separator'
+                pos = end
+
+        self.buffer = buffer[pos:]
+        return ships
+
+    def close(self):
+        """Finish parsing, raising ValueError if the export was incomplete"""
+        self.buffer += self.text.decode(b'', final=True)
+        self.drain()
+        if self.state != 'done':
+            self.fail("File ended before the ship list was complete")
+        if self.valid_count == 0 and self.error_count:
+            self.fail("No valid ships found in file")